@@ -0,0 +1,220 @@
+import argparse
+import json
+import platform
+import sys
+from statistics import median
+from time import perf_counter
+from src.board import Board
+from src.board_element import BoardElementState
+from src.board_storage import BoardStorage, MINE_BIT
+
+DEFAULT_SIZES = ((9, 9), (16, 30), (100, 100), (300, 300))
+DEFAULT_DENSITIES = (0.12, 0.16, 0.21)
+DEFAULT_THRESHOLD = 0.15
+"""Relative slowdown against the baseline above which a benchmark counts as a regression."""
+DEFAULT_MIN_TIME = 0.02
+SEED = 12345
+
+
+def _new_board(rows: int, cols: int, mines: int):
+    board = Board(rows, cols, mines, seed=SEED)
+    board.calculate_proximities()
+    return board
+
+
+def _single_mine_board(rows: int, cols: int):
+    """
+    :return: Returns a board whose only mine is in the upper left corner, so revealing the opposite corner cascades
+    through the whole board.
+    """
+    cells = bytearray(rows * cols)
+    cells[0] = MINE_BIT
+    board = Board._from_storage(rows, cols, BoardStorage(cells=cells), SEED)
+    board.calculate_proximities()
+    return board
+
+
+def _chord_board(rows: int, cols: int, mines: int):
+    """
+    :return: Returns a board and the fields to chord: every empty field next to a mine is revealed and all mines are
+    flagged, so each chord reveals the hidden neighbours of one field.
+    """
+    board = _new_board(rows, cols, mines)
+    storage = board.elements
+    targets = []
+    for idx in range(board.number_of_elements):
+        if storage.is_mine(idx):
+            storage.set_state(idx, BoardElementState.FLAGGED)
+        elif storage.proximity(idx) > 0:
+            targets.append(idx)
+    for idx in targets[::2]:
+        storage.set_state(idx, BoardElementState.REVEALED)
+    return board, [board.index_to_coordinates(idx) for idx in targets[::2]]
+
+
+def _bench_init(rows: int, cols: int, mines: int):
+    return None, lambda _: Board(rows, cols, mines, seed=SEED), 1
+
+
+def _bench_calculate_proximities(rows: int, cols: int, mines: int):
+    return Board(rows, cols, mines, seed=SEED), Board.calculate_proximities, 1
+
+
+def _bench_reveal_cascade(rows: int, cols: int, mines: int):
+    # The worst case does not depend on the density: a single cascade through the whole board.
+    return _single_mine_board(rows, cols), lambda board: board.reveal_element(rows - 1, cols - 1), 1
+
+
+def _bench_auto_reveal(rows: int, cols: int, mines: int):
+    board, targets = _chord_board(rows, cols, mines)
+
+    def chord_all(board: Board):
+        for row, col in targets:
+            board.auto_reveal(row, col)
+    return board, chord_all, max(1, len(targets))
+
+
+def _bench_check_win_state(rows: int, cols: int, mines: int):
+    calls = 1000
+
+    def check(board: Board):
+        for _ in range(calls):
+            board.check_win_state()
+    return _new_board(rows, cols, mines), check, calls
+
+
+def _bench_getitem(rows: int, cols: int, mines: int):
+    coordinates = [(row, col) for row in range(rows) for col in range(cols)]
+
+    def get_all(board: Board):
+        for row, col in coordinates:
+            board[row, col]
+    return _new_board(rows, cols, mines), get_all, len(coordinates)
+
+
+def _bench_str(rows: int, cols: int, mines: int):
+    return _new_board(rows, cols, mines), str, 1
+
+
+BENCHMARKS = {
+    "init": _bench_init,
+    "calculate_proximities": _bench_calculate_proximities,
+    "reveal_cascade": _bench_reveal_cascade,
+    "auto_reveal": _bench_auto_reveal,
+    "check_win_state": _bench_check_win_state,
+    "getitem": _bench_getitem,
+    "str": _bench_str,
+}
+"""Benchmark factories by operation. A factory takes the board parameters and returns a fresh subject, the timed
+callable taking the subject, and the number of operations one call makes. Subjects are created outside the timing."""
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, densities=DEFAULT_DENSITIES, operations=None, repeat: int = 5,
+                   min_time: float = DEFAULT_MIN_TIME):
+    """
+    Times every operation on every combination of board size and mine density, with fixed seeds.
+    :param sizes: Iterable of (rows, columns) tuples.
+    :param densities: Iterable of mine densities, i.e. the fraction of fields which are mines.
+    :param operations: Names of the BENCHMARKS to run, all of them by default.
+    :param repeat: Number of timed samples per benchmark.
+    :param min_time: Minimum duration of a sample in seconds. Fast operations are run on as many fresh subjects as
+    needed to reach it, which keeps the timer resolution and scheduling noise out of the results.
+    :return: Returns a list of result dictionaries with the operation, board parameters, number of operations per
+    sample, and the minimum and median time per operation in seconds.
+    """
+    results = []
+    for name in operations or BENCHMARKS:
+        factory = BENCHMARKS[name]
+        for rows, cols in sizes:
+            for density in densities:
+                mines = max(1, min(round(density * rows * cols), rows * cols - 1))
+                number = 1
+                while True:
+                    elapsed, calls = _sample(factory, rows, cols, mines, number)
+                    if elapsed >= min_time or number >= 1 << 20:
+                        break
+                    number *= 2
+                timings = [elapsed / calls]
+                for _ in range(repeat - 1):
+                    elapsed, calls = _sample(factory, rows, cols, mines, number)
+                    timings.append(elapsed / calls)
+                results.append({"operation": name, "rows": rows, "columns": cols, "mines": mines, "calls": calls,
+                                "min": min(timings), "median": median(timings)})
+    return results
+
+
+def _sample(factory, rows: int, cols: int, mines: int, number: int):
+    """
+    :return: Returns the time of running an operation on number fresh subjects, and the number of operations made.
+    """
+    subjects = [factory(rows, cols, mines) for _ in range(number)]
+    start = perf_counter()
+    for subject, operation, _ in subjects:
+        operation(subject)
+    return perf_counter() - start, sum(calls for _, _, calls in subjects)
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float = DEFAULT_THRESHOLD):
+    """
+    Compares results with a stored baseline by their minimum times, which are the least noisy.
+    :param threshold: Relative slowdown above which a benchmark counts as a regression.
+    :return: Returns a list of (key, baseline time, current time, ratio, regressed) tuples for the benchmarks present
+    in both.
+    """
+    baseline_by_key = {_key(result): result for result in baseline}
+    comparison = []
+    for result in results:
+        reference = baseline_by_key.get(_key(result))
+        if reference is None:
+            continue
+        ratio = result["min"] / reference["min"] if reference["min"] else float("inf")
+        comparison.append((_key(result), reference["min"], result["min"], ratio, ratio > 1 + threshold))
+    return comparison
+
+
+def _key(result: dict):
+    return f"{result['operation']}/{result['rows']}x{result['columns']}/{result['mines']}"
+
+
+def _parse_sizes(text: str):
+    return tuple(tuple(int(part) for part in size.split("x")) for size in text.split(","))
+
+
+def main(arguments: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Benchmarks of the Board hot paths.")
+    parser.add_argument("--sizes", type=_parse_sizes, default=DEFAULT_SIZES,
+                        help="Comma separated board sizes, e.g. 9x9,100x100.")
+    parser.add_argument("--densities", type=lambda text: tuple(float(part) for part in text.split(",")),
+                        default=DEFAULT_DENSITIES, help="Comma separated mine densities.")
+    parser.add_argument("--operations", type=lambda text: text.split(","),
+                        help=f"Comma separated operations out of {', '.join(BENCHMARKS)}.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help="Minimum duration of a timed sample in seconds.")
+    parser.add_argument("--output", help="File to write the results to as JSON, printed if omitted.")
+    parser.add_argument("--compare", help="Baseline JSON file written by --output to compare the results with.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    arguments = parser.parse_args(arguments)
+    results = run_benchmarks(arguments.sizes, arguments.densities, arguments.operations, arguments.repeat,
+                             arguments.min_time)
+    document = {"python": sys.version, "platform": platform.platform(), "seed": SEED, "results": results}
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(document, file, indent=2)
+    elif not arguments.compare:
+        print(json.dumps(document, indent=2))
+    if not arguments.compare:
+        return 0
+    with open(arguments.compare) as file:
+        baseline = json.load(file)["results"]
+    regressions = 0
+    for key, baseline_time, current_time, ratio, regressed in compare(results, baseline, arguments.threshold):
+        regressions += regressed
+        print(f"{key:45} {baseline_time * 1e6:12.3f}us {current_time * 1e6:12.3f}us {ratio:7.2f}x"
+              f"{'  REGRESSION' if regressed else ''}")
+    print(f"{regressions} regression(s) above {arguments.threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
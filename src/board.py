@@ -1,6 +1,13 @@
 from src.board_element import BoardElement, BoardElementState
-from random import sample
+from src.board_storage import (BoardStorage, BoardElementView, MINE_BIT, STATE_MASK, PROXIMITY_MASK, HIDDEN_BITS,
+                               FLAGGED_BITS, REVEALED_BITS, ZERO_PROXIMITY_BITS)
+from src.neighbours import NeighbourTable, ArithmeticNeighbourTable, neighbour_table
+from src.generation import place_mines, EmptyElementIndex
+from src.proximity import count_neighbouring_mines
+from src.rendering import BoardRenderer, SOLUTION_VIEW
+from random import Random, SystemRandom
 from enum import Enum
+from typing import Callable, NamedTuple
 
 
 class GameState(Enum):
@@ -15,32 +22,107 @@ class GameState(Enum):
     """Game has been lost by the player."""
 
 
+class MoveType(Enum):
+    """Enum representing the moves a player can make."""
+    REVEAL = 0
+    """Reveal a field, see Board.reveal_element."""
+    FLAG = 1
+    """Toggle the flag on a field, see Board.toggle_flag_on_element."""
+    CHORD = 2
+    """Reveal the neighbours of a revealed field whose mines are all flagged, see Board.auto_reveal."""
+
+
+class CellChange(NamedTuple):
+    """A field whose state has been changed by a move."""
+    index: int
+    old_state: BoardElementState
+    new_state: BoardElementState
+
+
+class BoardDelta(NamedTuple):
+    """
+    Everything a move has changed on the board, so a user interface can redraw only the changed fields.
+    """
+    move: tuple[MoveType, int, int] | None
+    """The (MoveType, row, column) of the move, or None if only the game state has been changed directly."""
+    cell_changes: tuple[CellChange, ...]
+    """The fields whose state has changed, in the order of the changes."""
+    old_game_state: GameState
+    new_game_state: GameState
+    relocated_mine: tuple[int, int] | None = None
+    """The indices of the field a mine has been moved away from and of the field it has been moved to, if the delta
+    is the result of swap_mine_with_empty_element."""
+
+    @property
+    def game_state_changed(self):
+        return self.old_game_state != self.new_game_state
+
+
 class Board:
     """
     Class representing the game board.
     """
-    def __init__(self, number_of_rows: int, number_of_columns: int, number_of_mines: int):
+    debug = False
+    """If True, the running counters are validated against a full scan of the board whenever the win state is
+    checked."""
+
+    def __init__(self, number_of_rows: int, number_of_columns: int, number_of_mines: int, seed: int | None = None,
+                 safe_opening: tuple[int, int] | None = None):
         """
         Constructor method for the game board.
-        :param number_of_rows: Number of rows on the game board, must be an integer between 1 and 30 (inclusive).
-        :param number_of_columns: Number of columns on the game board, must be an integer between 1 and 30 (inclusive).
+        :param number_of_rows: Number of rows on the game board, must be a positive integer.
+        :param number_of_columns: Number of columns on the game board, must be a positive integer.
         :param number_of_mines: Number of hidden mines scattered throughout the game board. Must be an integer
         between 1 and N - 1, where N is the total number of fields on the board.
+        :param seed: Seed of the random number generator the mines are placed with, the same seed always gives the same
+        board. If omitted, a random seed is chosen, which is available through the seed attribute.
+        :param safe_opening: Optional (row, column) coordinates of the first field the player will reveal. Neither this
+        field nor its neighbours will contain a mine, so no mine has to be swapped away after the first click.
         """
-        if number_of_rows <= 0 or number_of_columns <= 0:
-            raise ValueError("The board must have a positive number of rows and columns.")
-        if number_of_rows > 30 or number_of_columns > 30:
-            raise ValueError("The board size cannot exceed 30x30.")
+        self._initialize(number_of_rows, number_of_columns, number_of_mines, seed)
         if number_of_mines <= 0:
             raise ValueError("The board must have at least one mine.")
+        if number_of_mines >= self._number_of_elements:
+            raise ValueError("The number of mines must be less than the number of board elements.")
+        self._storage: BoardStorage = self._set_up_board(safe_opening)
+
+    @classmethod
+    def _from_storage(cls, number_of_rows: int, number_of_columns: int, storage: BoardStorage, seed: int,
+                      game_state: GameState = GameState.INITIALIZED, number_of_moves: int = 0):
+        """
+        Alternate constructor for a board whose fields have already been packed, e.g. from a snapshot. The random
+        number generator starts over from the seed. The number of mines is not validated, so boards without mines or
+        without empty fields can be built, e.g. as test fixtures.
+        :param storage: The fields of the board, which must hold number_of_rows * number_of_columns fields.
+        :return: Returns the new board, which takes ownership of the storage.
+        """
+        if len(storage) != number_of_rows * number_of_columns:
+            raise ValueError(f"Expected {number_of_rows * number_of_columns} board elements, got {len(storage)}.")
+        board = cls.__new__(cls)
+        board._initialize(number_of_rows, number_of_columns, storage.number_of_mines, seed)
+        board._storage = storage
+        board._game_state = game_state
+        board._number_of_moves = number_of_moves
+        return board
+
+    def _initialize(self, number_of_rows: int, number_of_columns: int, number_of_mines: int, seed: int | None):
+        if number_of_rows <= 0 or number_of_columns <= 0:
+            raise ValueError("The board must have a positive number of rows and columns.")
         self._number_of_rows = number_of_rows
         self._number_of_columns = number_of_columns
         self._number_of_elements = number_of_rows * number_of_columns
-        if number_of_mines >= self._number_of_elements:
-            raise ValueError("The number of mines must be less than the number of board elements.")
         self._number_of_mines = number_of_mines
         self._game_state = GameState.INITIALIZED
-        self._elements: list[BoardElement] = self._set_up_board()
+        self._number_of_moves = 0
+        self._seed = seed if seed is not None else SystemRandom().getrandbits(64)
+        self._random = Random(self._seed)
+        self._empty_element_index: EmptyElementIndex | None = None
+        self._empty_element_index_version = 0
+        """The mine_version of the storage the empty element index is up to date with."""
+        self._neighbour_table: NeighbourTable | ArithmeticNeighbourTable | None = None
+        self._subscribers: list[Callable[[BoardDelta], None]] = []
+        self._move_in_progress = False
+        self._renderers: dict[str, BoardRenderer] = {}
 
     def __getitem__(self, coordinates: int | tuple[int, int]):
         """
@@ -68,15 +150,18 @@ class Board:
         :return: Returns a string representation of the board displaying elements as mines ('m') or their
         proximity numbers (for empty fields).
         """
-        horizontal_separator = "*" * (self.number_of_columns * 4 + 1) + "\n"
-        def get_elements_in_row(row_number: int):
-            return (self[row_number, j] for j in range(0, self.number_of_columns))
-        string_rep_list = [horizontal_separator]
-        for i in range(0, self.number_of_rows):
-            row_rep_list = "".join(['*'] + [' ' +  str(element) + " " + "*" for element in get_elements_in_row(i)]
-                                   + ["\n" + horizontal_separator])
-            string_rep_list += row_rep_list
-        return "".join(string_rep_list)
+        return self.render()
+
+    def render(self, view: str = SOLUTION_VIEW):
+        """
+        Renders the board as text, re-rendering only the rows which have changed since the last call.
+        :param view: SOLUTION_VIEW shows mines and proximity numbers, PLAYER_VIEW shows what the player sees.
+        :return: Returns the board as a string of rows framed by asterisks.
+        """
+        renderer = self._renderers.get(view)
+        if renderer is None:
+            renderer = self._renderers[view] = BoardRenderer(self, view)
+        return renderer.render()
 
     @property
     def number_of_rows(self):
@@ -98,6 +183,16 @@ class Board:
         """The total number of mines on the board. This attribute is immutable."""
         return self._number_of_mines
 
+    @property
+    def seed(self):
+        """The seed of the random number generator used by the board. This attribute is immutable."""
+        return self._seed
+
+    @property
+    def number_of_moves(self):
+        """The number of reveal, flag and chord moves made on the board."""
+        return self._number_of_moves
+
     @property
     def game_state(self):
         """The state of the game. Can be INITIALIZED, STARTED, WIN or LOSS."""
@@ -105,13 +200,87 @@ class Board:
 
     @game_state.setter
     def game_state(self, value: GameState):
-        if self.game_state != GameState.LOSS:
-            self._game_state = value
+        old_game_state = self._game_state
+        if old_game_state == GameState.LOSS or value == old_game_state:
+            return
+        self._game_state = value
+        if self._subscribers and not self._move_in_progress:
+            self._publish(BoardDelta(None, (), old_game_state, value))
+
+    @property
+    def number_of_flags(self):
+        """The number of flags placed on the board."""
+        return self._storage.number_of_flags
+
+    @property
+    def remaining_mines(self):
+        """The number of mines minus the number of flags placed, as shown to the player."""
+        return self._storage.number_of_mines - self._storage.number_of_flags
+
+    @property
+    def cells_left(self):
+        """The number of empty fields which are yet to be revealed."""
+        storage = self._storage
+        return self.number_of_elements - storage.number_of_mines - storage.number_of_revealed_empty_elements
 
     @property
     def elements(self):
-        """List of all the fields on the board. This attribute is immutable."""
-        return self._elements
+        """Sequence of all the fields on the board. This attribute is immutable."""
+        return self._storage
+
+    @property
+    def _elements(self):
+        return self._storage
+
+    @_elements.setter
+    def _elements(self, value):
+        """
+        Replaces the fields of the board. A sequence of BoardElements is packed into a new BoardStorage, any other
+        sequence is kept as it is and only supports element access.
+        """
+        if not isinstance(value, BoardStorage) and all(isinstance(element, BoardElement) for element in value):
+            value = BoardStorage.from_elements(value)
+        self._storage = value
+        self._empty_element_index = None
+
+    def to_bytes(self):
+        """
+        :return: Returns a compact binary snapshot of the board, see src.snapshot.
+        """
+        from src.snapshot import board_to_bytes
+        return board_to_bytes(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """
+        :param data: A snapshot created by to_bytes.
+        :return: Returns the restored board.
+        """
+        from src.snapshot import board_from_bytes
+        return board_from_bytes(data)
+
+    def save(self, path):
+        """Writes a binary snapshot of the board to a file."""
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        :param path: Path of a file written by save.
+        :return: Returns the restored board.
+        """
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+    def instrument(self):
+        """
+        :return: Returns an enabled BoardInstrumentation of the board, see src.instrumentation.
+        """
+        from src.instrumentation import BoardInstrumentation
+        instrumentation = BoardInstrumentation(self)
+        instrumentation.enable()
+        return instrumentation
 
     def index_to_coordinates(self, idx: int):
         if idx < 0 or idx >= self.number_of_elements:
@@ -128,84 +297,249 @@ class Board:
         Specify a board element. If it is a mine, it will be swapped with a random empty element.
         :param row: Row index of the board element.
         :param col: Column index of the board element.
+        :return: Returns the index of the element the mine has been swapped with, or None if there was no mine.
         """
         idx_mine = self.coordinates_to_index(row, col)
-        idx_empty = sample([(idx, element) for (idx, element) in enumerate(self.elements) if not element.is_mine],
-                           k=1)[0][0]
-        self._elements[idx_mine], self._elements[idx_empty] = self._elements[idx_empty], self._elements[idx_mine]
+        storage = self._storage
+        cells = storage.cells
+        if not cells[idx_mine] & MINE_BIT:
+            return None
+        if self._empty_element_index is None or self._empty_element_index_version != storage.mine_version:
+            # Mines toggled through the board elements make the index stale.
+            self._empty_element_index = EmptyElementIndex.from_cells(cells)
+        idx_empty = self._empty_element_index.relocate_mine(idx_mine, self._random)
+        storage.swap(idx_mine, idx_empty)
+        self._empty_element_index_version = storage.mine_version
+        if self._subscribers:
+            self._publish(BoardDelta(None, (), self._game_state, self._game_state, (idx_mine, idx_empty)))
+        return idx_empty
 
     def calculate_proximities(self):
         """
         Computes the proximity numbers for all board elements (i.e. how many mines are nearby).
         """
-        empty_elements = [(idx, element) for (idx, element) in enumerate(self.elements) if not element.is_mine]
-        for idx, element in empty_elements:
-            row, col = self.index_to_coordinates(idx)
-            proximity = self._calculate_proximity_for_single_element(row, col)
-            element.proximity = proximity
+        storage = self._storage
+        storage.set_proximities(count_neighbouring_mines(storage.mine_grid(), self.number_of_rows,
+                                                         self.number_of_columns))
 
     def check_win_state(self):
         """
         Checks whether the game is in a win state and updates the game_state field accordingly.
         """
-        all_mines_flagged = all([element.state == BoardElementState.FLAGGED for element in self.elements if element.is_mine])
-        all_non_mines_revealed = all([element.state == BoardElementState.REVEALED
-                                     for element in self.elements if not element.is_mine])
+        storage = self._storage
+        if self.debug:
+            storage.validate_counters()
+        all_mines_flagged = storage.number_of_flagged_mines == storage.number_of_mines
+        all_non_mines_revealed = self.cells_left == 0
         if all_mines_flagged and all_non_mines_revealed and not self.game_state == GameState.LOSS:
             self.game_state = GameState.WIN
 
+    def subscribe(self, callback: Callable[[BoardDelta], None]):
+        """
+        Registers a callback which is called with a BoardDelta after every move, and whenever the game state is changed
+        outside of a move (e.g. by check_win_state). Changes are only recorded while there are subscribers, so the
+        moves of a board without subscribers cost nothing extra.
+        :param callback: Callable taking a BoardDelta.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[BoardDelta], None]):
+        """
+        Removes a callback registered with subscribe.
+        :raise ValueError: If the callback is not subscribed.
+        """
+        self._subscribers.remove(callback)
+
+    def play(self, move_type: MoveType, row: int, col: int):
+        """
+        Makes a move like reveal_element, toggle_flag_on_element or auto_reveal, and records what it has changed.
+        :param move_type: The type of the move.
+        :param row: Row index of the board element.
+        :param col: Column index of the board element.
+        :return: Returns the BoardDelta of the move, which is also passed to the subscribers.
+        """
+        return self._play(move_type, row, col)[1]
+
     def reveal_element(self, row: int, col: int):
         """
         Reveals the specified board element if it is not already revealed. If the element has zero proximity number,
-        all neighbours will also be revealed in a recursive manner.
+        all neighbours will also be revealed, cascading through the whole region of zero proximity numbers.
         :param row: Row index of the board element to be revealed.
         :param col: Column index of the board element to be revealed.
+        :return: Returns the set of indices of the board elements which have been revealed by this call.
         """
-        element = self[row, col]
-        if element.state == BoardElementState.REVEALED:
-            return
-        element.state = BoardElementState.REVEALED
-        if element.is_mine:
-            self.game_state = GameState.LOSS
-            return
-        if element.proximity == 0:
-            nearby_coords = self._get_neighbouring_indices(row, col)
-            for coords in nearby_coords:
-                self.reveal_element(*coords)
+        if self._subscribers:
+            return self._play(MoveType.REVEAL, row, col)[0]
+        idx = self.coordinates_to_index(row, col)
+        self._number_of_moves += 1
+        return self._reveal(idx)
 
     def toggle_flag_on_element(self, row: int, col: int):
-        element = self[row, col]
-        if element.state == BoardElementState.REVEALED:
-            return
-        is_flagged = element.state == BoardElementState.FLAGGED
-        element.state = BoardElementState.FLAGGED if not is_flagged else BoardElementState.HIDDEN
+        if self._subscribers:
+            self._play(MoveType.FLAG, row, col)
+        else:
+            idx = self.coordinates_to_index(row, col)
+            self._number_of_moves += 1
+            self._toggle_flag(idx)
 
     def auto_reveal(self, row: int, col: int):
-        element = self[row, col]
-        if element.state == BoardElementState.REVEALED and not element.is_mine and element.proximity > 0:
-            coords_of_nearby_elements = self._get_neighbouring_indices(row, col)
-            number_of_nearby_flags = sum(1 for i, j in coords_of_nearby_elements
-                                         if self[i, j].state == BoardElementState.FLAGGED)
-            if number_of_nearby_flags == element.proximity:
-                for i, j in coords_of_nearby_elements:
-                    if self[i, j].state == BoardElementState.HIDDEN:
-                        self.reveal_element(i, j)
-
-    def _set_up_board(self):
-        bomb_indices = sample(range(0, self.number_of_elements), k=self.number_of_mines)
-        list_of_elements = [BoardElement(mined=True) if idx in bomb_indices else BoardElement(mined=False)
-                            for idx in range(0, self.number_of_elements)]
-        return list_of_elements
-
-    def _calculate_proximity_for_single_element(self, row: int, col: int):
-        coords_of_elements_in_proximity = self._get_neighbouring_indices(row, col)
-        return len([self[i, j] for i, j in coords_of_elements_in_proximity if self[i, j].is_mine])
-
-    def _get_neighbouring_indices(self, row: int, col: int):
-        index_offset = (-1, 0, 1)
-        return [(row + i, col + j) for i in index_offset for j in index_offset
-                if not (i == 0 and j == 0) and (0 <= row + i < self.number_of_rows)
-                and (0 <= col + j < self.number_of_columns)]
+        """
+        Reveals all hidden neighbours of a revealed board element, if the number of flags around it equals its
+        proximity number.
+        :param row: Row index of the revealed board element.
+        :param col: Column index of the revealed board element.
+        :return: Returns the set of indices of the board elements which have been revealed by this call.
+        """
+        if self._subscribers:
+            return self._play(MoveType.CHORD, row, col)[0]
+        idx = self.coordinates_to_index(row, col)
+        self._number_of_moves += 1
+        return self._auto_reveal(idx)
+
+    def _element_at(self, idx: int):
+        """
+        Unchecked counterpart of __getitem__ for internal use.
+        :param idx: Index of the board element, which must be valid.
+        :return: Returns a view of the board element.
+        """
+        return BoardElementView(self._storage, idx)
+
+    @property
+    def _neighbours(self):
+        """The neighbour table of this shape, see neighbour_table(), looked up on first use."""
+        if self._neighbour_table is None:
+            self._neighbour_table = neighbour_table(self.number_of_rows, self.number_of_columns)
+        return self._neighbour_table
+
+    def _play(self, move_type: MoveType, row: int, col: int):
+        """
+        Makes a move while recording the changes of the fields in the storage, and publishes the resulting delta.
+        :return: Returns the result of the move and its BoardDelta.
+        """
+        idx = self.coordinates_to_index(row, col)
+        self._number_of_moves += 1
+        storage = self._storage
+        old_game_state = self._game_state
+        self._move_in_progress = True
+        storage.start_change_log()
+        try:
+            result = self._MOVES[move_type](self, idx)
+        finally:
+            changes = storage.stop_change_log()
+            self._move_in_progress = False
+        delta = BoardDelta((move_type, row, col), tuple(map(CellChange._make, changes)), old_game_state,
+                           self._game_state)
+        self._publish(delta)
+        return result, delta
+
+    def _undo(self, delta: BoardDelta, random_state: tuple | None = None):
+        """
+        Reverts the changes of a delta, which must be the latest change of the board that has not been reverted yet.
+        The subscribers receive the inverse delta.
+        :param delta: The delta to revert.
+        :param random_state: For a relocated mine, the state of the random number generator before the relocation.
+        :return: Returns the inverse delta.
+        """
+        storage = self._storage
+        for change in reversed(delta.cell_changes):
+            storage.set_state(change.index, change.old_state)
+        self._game_state = delta.old_game_state
+        if delta.move is not None:
+            self._number_of_moves -= 1
+        relocated_mine = None
+        if delta.relocated_mine is not None:
+            idx_mine, idx_empty = delta.relocated_mine
+            index_is_current = self._empty_element_index_version == storage.mine_version
+            storage.swap(idx_mine, idx_empty)
+            if self._empty_element_index is not None and index_is_current:
+                self._empty_element_index.restore_mine(idx_mine, idx_empty)
+                self._empty_element_index_version = storage.mine_version
+            if random_state is not None:
+                self._random.setstate(random_state)
+            self._update_proximities_around(delta.relocated_mine)
+            relocated_mine = (idx_empty, idx_mine)
+        inverse = BoardDelta(None, tuple(CellChange(change.index, change.new_state, change.old_state)
+                                         for change in reversed(delta.cell_changes)),
+                             delta.new_game_state, delta.old_game_state, relocated_mine)
+        if self._subscribers:
+            self._publish(inverse)
+        return inverse
+
+    def _update_proximities_around(self, indices):
+        """
+        Recomputes the proximities of the given fields and their neighbours, e.g. after a mine has been moved.
+        """
+        storage = self._storage
+        cells = storage.cells
+        neighbours = self._neighbours.neighbours
+        for idx in {field for idx in indices for field in (idx, *neighbours(idx))}:
+            if not cells[idx] & MINE_BIT:
+                storage.set_proximity(idx, sum(cells[neighbour] & MINE_BIT for neighbour in neighbours(idx)))
+
+    def _publish(self, delta: BoardDelta):
+        for callback in tuple(self._subscribers):
+            callback(delta)
+
+    def _reveal(self, idx: int):
+        storage = self._storage
+        cells = storage.cells
+        if cells[idx] & STATE_MASK == REVEALED_BITS:
+            return set()
+        storage.set_state(idx, BoardElementState.REVEALED)
+        revealed = {idx}
+        if cells[idx] & MINE_BIT:
+            self.game_state = GameState.LOSS
+            return revealed
+        neighbours = self._neighbours.neighbours
+        to_expand = [idx] if cells[idx] & PROXIMITY_MASK == ZERO_PROXIMITY_BITS else []
+        while to_expand:
+            for neighbour in neighbours(to_expand.pop()):
+                cell = cells[neighbour]
+                if cell & STATE_MASK == REVEALED_BITS:
+                    continue
+                storage.set_state(neighbour, BoardElementState.REVEALED)
+                revealed.add(neighbour)
+                if cell & MINE_BIT:
+                    self.game_state = GameState.LOSS
+                elif cell & PROXIMITY_MASK == ZERO_PROXIMITY_BITS:
+                    to_expand.append(neighbour)
+        return revealed
+
+    def _toggle_flag(self, idx: int):
+        storage = self._storage
+        state = storage.state(idx)
+        if state == BoardElementState.REVEALED:
+            return
+        storage.set_state(idx, BoardElementState.FLAGGED if state == BoardElementState.HIDDEN
+                          else BoardElementState.HIDDEN)
+
+    def _auto_reveal(self, idx: int):
+        revealed = set()
+        storage = self._storage
+        cells = storage.cells
+        cell = cells[idx]
+        proximity = storage.proximity(idx)
+        if cell & STATE_MASK != REVEALED_BITS or cell & MINE_BIT or proximity <= 0:
+            return revealed
+        nearby_indices = self._neighbours.neighbours(idx)
+        number_of_nearby_flags = sum(1 for i in nearby_indices if cells[i] & STATE_MASK == FLAGGED_BITS)
+        if number_of_nearby_flags == proximity:
+            for i in nearby_indices:
+                if cells[i] & STATE_MASK == HIDDEN_BITS:
+                    revealed |= self._reveal(i)
+        return revealed
+
+    _MOVES = {MoveType.REVEAL: _reveal, MoveType.FLAG: _toggle_flag, MoveType.CHORD: _auto_reveal}
+
+    def _set_up_board(self, safe_opening: tuple[int, int] | None = None):
+        excluded = []
+        if safe_opening is not None:
+            row, col = safe_opening
+            idx = self.coordinates_to_index(row, col)
+            excluded = [idx, *self._neighbours.neighbours(idx)]
+        cells, self._empty_element_index = place_mines(self.number_of_elements, self.number_of_mines, self._random,
+                                                       excluded)
+        return BoardStorage(cells=cells)
 
 
 if __name__ == "__main__":
@@ -15,6 +15,8 @@ class BoardElement:
     """
     Represents a field in the Minesweeper board.
     """
+    __slots__ = ("_is_mine", "_state", "_proximity")
+
     def __init__(self, mined: bool):
         """
         Constructs a board element. The default state is HIDDEN, and with unassigned proximity (-1).
@@ -52,11 +54,15 @@ class BoardElement:
 
     @proximity.setter
     def proximity(self, value: int):
-        if not isinstance(value, int):
-            raise ValueError("Proximity must be an integer.")
-        if value < 0 or value > 8:
-            raise ValueError("Proximity must be between 0 and 8.")
+        validate_proximity(value)
         self._proximity = value
 
     def toggle_mine(self):
         self._is_mine = not self._is_mine
+
+
+def validate_proximity(value: int):
+    if not isinstance(value, int):
+        raise ValueError("Proximity must be an integer.")
+    if value < 0 or value > 8:
+        raise ValueError("Proximity must be between 0 and 8.")
@@ -0,0 +1,288 @@
+from src.board_element import BoardElement, BoardElementState, validate_proximity
+
+MINE_BIT = 0x01
+"""Bit that marks a cell as a mine."""
+STATE_SHIFT = 1
+STATE_MASK = 0x06
+"""Two bits holding the value of the cell's BoardElementState."""
+PROXIMITY_SHIFT = 3
+PROXIMITY_MASK = 0x78
+"""Four bits holding the proximity number plus one, so that the unassigned proximity (-1) is stored as zero."""
+
+HIDDEN_BITS = BoardElementState.HIDDEN.value << STATE_SHIFT
+FLAGGED_BITS = BoardElementState.FLAGGED.value << STATE_SHIFT
+REVEALED_BITS = BoardElementState.REVEALED.value << STATE_SHIFT
+ZERO_PROXIMITY_BITS = 1 << PROXIMITY_SHIFT
+
+HIDDEN_SYMBOL = "#"
+"""Symbol of a hidden field in the player's view of a board."""
+FLAG_SYMBOL = "F"
+"""Symbol of a flagged field in the player's view of a board."""
+
+
+def _player_view_symbol(cell: int):
+    state_bits = cell & STATE_MASK
+    if state_bits == HIDDEN_BITS:
+        return HIDDEN_SYMBOL
+    if state_bits == FLAGGED_BITS:
+        return FLAG_SYMBOL
+    if cell & MINE_BIT:
+        return "m"
+    proximity = ((cell & PROXIMITY_MASK) >> PROXIMITY_SHIFT) - 1
+    return str(proximity) if 0 <= proximity <= 8 else "?"
+
+
+PLAYER_VIEW_TABLE = "".join(_player_view_symbol(cell) for cell in range(256)).encode("ascii")
+"""Translation table from packed cells to the ASCII symbols the player sees: HIDDEN_SYMBOL, FLAG_SYMBOL, 'm' for a
+revealed mine and the proximity number otherwise."""
+
+_STATES = (BoardElementState.HIDDEN, BoardElementState.FLAGGED, BoardElementState.REVEALED)
+_CLASS_MASK = MINE_BIT | STATE_MASK
+_CLASS_TABLE = bytes(cell & _CLASS_MASK for cell in range(256))
+_STATE_TABLE = bytes(cell & STATE_MASK for cell in range(256))
+_MINE_TABLE = bytes(cell & MINE_BIT for cell in range(256))
+_CLEAR_EMPTY_PROXIMITY_TABLE = bytes(cell if cell & MINE_BIT else cell & ~PROXIMITY_MASK for cell in range(256))
+_MINED_COUNT = 9
+_PROXIMITY_CODE_TABLE = bytes((count + 1) << PROXIMITY_SHIFT if count < _MINED_COUNT else 0 for count in range(256))
+
+
+class BoardStorage:
+    """
+    Compact storage for the fields of a board. Every field is packed into a single byte of a bytearray, holding the
+    mine flag, the state and the proximity number. Indexing returns lightweight views that behave like BoardElements.
+    The storage keeps running counts of mines, flags and revealed fields, so the cells must only be modified through
+    its methods.
+    """
+    __slots__ = ("_cells", "_class_counts", "_change_log", "_mine_version")
+
+    def __init__(self, number_of_elements: int = 0, cells: bytearray | None = None):
+        """
+        Constructs a storage of empty, hidden fields with unassigned proximity.
+        :param number_of_elements: Number of fields to allocate. Ignored if cells is given.
+        :param cells: Already packed fields to wrap without copying.
+        """
+        self._cells = cells if cells is not None else bytearray(number_of_elements)
+        self._class_counts = self._scan_class_counts()
+        self._change_log: list[tuple[int, BoardElementState, BoardElementState]] | None = None
+        self._mine_version = 0
+
+    @classmethod
+    def from_elements(cls, elements):
+        """
+        Packs a sequence of BoardElements into a new storage.
+        :param elements: Iterable of BoardElement objects (or views).
+        :return: Returns the new storage.
+        """
+        return cls(cells=bytearray(pack_element(element) for element in elements))
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __getitem__(self, idx: int):
+        """
+        :param idx: Index of the field, negative indices count from the end like for lists.
+        :return: Returns a view of the field that reads and writes this storage.
+        """
+        if idx < 0:
+            idx += len(self._cells)
+        if idx < 0 or idx >= len(self._cells):
+            raise IndexError("Board storage index out of range.")
+        return BoardElementView(self, idx)
+
+    def __setitem__(self, idx: int, element: BoardElement):
+        self._replace_cell(idx, pack_element(element))
+
+    def __iter__(self):
+        return (BoardElementView(self, idx) for idx in range(len(self._cells)))
+
+    @property
+    def cells(self):
+        """The underlying bytearray, one byte per field. It must be treated as read-only."""
+        return self._cells
+
+    @property
+    def mine_version(self):
+        """Number of changes of the mine layout so far, to tell whether an index of the mines is stale."""
+        return self._mine_version
+
+    @property
+    def number_of_mines(self):
+        """The number of fields with a mine on them."""
+        counts = self._class_counts
+        return sum(counts[state_bits | MINE_BIT] for state_bits in (0, FLAGGED_BITS, REVEALED_BITS))
+
+    @property
+    def number_of_flags(self):
+        """The number of flagged fields, whether they are mines or not."""
+        return self._class_counts[FLAGGED_BITS] + self._class_counts[FLAGGED_BITS | MINE_BIT]
+
+    @property
+    def number_of_hidden_elements(self):
+        """The number of fields which are neither flagged nor revealed."""
+        return self._class_counts[HIDDEN_BITS] + self._class_counts[HIDDEN_BITS | MINE_BIT]
+
+    @property
+    def number_of_flagged_mines(self):
+        """The number of mines which have been flagged."""
+        return self._class_counts[FLAGGED_BITS | MINE_BIT]
+
+    @property
+    def number_of_revealed_empty_elements(self):
+        """The number of empty fields which have been revealed."""
+        return self._class_counts[REVEALED_BITS]
+
+    def validate_counters(self):
+        """
+        Compares the running counts against a full scan of the cells.
+        :raise RuntimeError: If the counts are out of sync with the cells.
+        """
+        scanned_counts = self._scan_class_counts()
+        if scanned_counts != self._class_counts:
+            raise RuntimeError(f"Board storage counters out of sync: counted {self._class_counts}, "
+                               f"scanned {scanned_counts}.")
+
+    def is_mine(self, idx: int):
+        return bool(self._cells[idx] & MINE_BIT)
+
+    def state(self, idx: int):
+        return _STATES[(self._cells[idx] & STATE_MASK) >> STATE_SHIFT]
+
+    def set_state(self, idx: int, value: BoardElementState):
+        self._replace_cell(idx, (self._cells[idx] & ~STATE_MASK) | (value.value << STATE_SHIFT))
+
+    def proximity(self, idx: int):
+        return ((self._cells[idx] & PROXIMITY_MASK) >> PROXIMITY_SHIFT) - 1
+
+    def set_proximity(self, idx: int, value: int):
+        self._cells[idx] = (self._cells[idx] & ~PROXIMITY_MASK) | ((value + 1) << PROXIMITY_SHIFT)
+
+    def toggle_mine(self, idx: int):
+        self._replace_cell(idx, self._cells[idx] ^ MINE_BIT)
+
+    def mine_grid(self):
+        """
+        :return: Returns a bytes object with 1 for every mine and 0 for every empty field.
+        """
+        return self._cells.translate(_MINE_TABLE)
+
+    def set_proximities(self, counts: bytes):
+        """
+        Assigns the proximity numbers of all empty fields at once. The proximities of mines are left untouched.
+        :param counts: The number of neighbouring mines (0..8) for every field, one byte per field.
+        """
+        n = len(self._cells)
+        mines = int.from_bytes(self.mine_grid(), "little")
+        # Mines get a count no proximity can have, which the code table maps to "keep the current proximity bits".
+        codes = (int.from_bytes(counts, "little") + mines * _MINED_COUNT).to_bytes(n, "little")
+        kept = int.from_bytes(self._cells.translate(_CLEAR_EMPTY_PROXIMITY_TABLE), "little")
+        self._cells[:] = (kept + int.from_bytes(codes.translate(_PROXIMITY_CODE_TABLE), "little")).to_bytes(n, "little")
+
+    def state_bits(self):
+        """
+        :return: Returns a bytes object holding only the state bits of every field.
+        """
+        return self._cells.translate(_STATE_TABLE)
+
+    def restore_state_bits(self, state_bits: bytes):
+        """
+        Sets the states of all fields at once.
+        :param state_bits: The state bits of every field, as returned by state_bits().
+        """
+        n = len(self._cells)
+        kept = int.from_bytes(self._cells, "little") - int.from_bytes(self.state_bits(), "little")
+        self._cells[:] = (kept + int.from_bytes(state_bits, "little")).to_bytes(n, "little")
+        self._class_counts = self._scan_class_counts()
+
+    def start_change_log(self):
+        """
+        Starts recording the state changes of single fields, until stop_change_log() is called. Bulk writes through
+        restore_state_bits() are not recorded.
+        """
+        self._change_log = []
+
+    def stop_change_log(self):
+        """
+        :return: Returns the list of (index, old state, new state) tuples recorded since start_change_log(), in the
+        order of the changes.
+        """
+        change_log = self._change_log
+        self._change_log = None
+        return change_log if change_log is not None else []
+
+    def swap(self, idx_a: int, idx_b: int):
+        """Swaps the contents of two fields."""
+        cells = self._cells
+        if (cells[idx_a] ^ cells[idx_b]) & MINE_BIT:
+            self._mine_version += 1
+        cells[idx_a], cells[idx_b] = cells[idx_b], cells[idx_a]
+
+    def _replace_cell(self, idx: int, cell: int):
+        counts = self._class_counts
+        counts[self._cells[idx] & _CLASS_MASK] -= 1
+        counts[cell & _CLASS_MASK] += 1
+        if self._change_log is not None and (self._cells[idx] ^ cell) & STATE_MASK:
+            self._change_log.append((idx, _STATES[(self._cells[idx] & STATE_MASK) >> STATE_SHIFT],
+                                     _STATES[(cell & STATE_MASK) >> STATE_SHIFT]))
+        if (self._cells[idx] ^ cell) & MINE_BIT:
+            self._mine_version += 1
+        self._cells[idx] = cell
+
+    def _scan_class_counts(self):
+        """
+        :return: Returns the number of fields for every combination of mine flag and state, indexed by the cell bits.
+        """
+        classes = self._cells.translate(_CLASS_TABLE)
+        return [classes.count(cell_class) for cell_class in range(_CLASS_MASK + 1)]
+
+
+class BoardElementView(BoardElement):
+    """
+    A BoardElement that does not hold its own data, but reads and writes a single byte of a BoardStorage.
+    """
+    __slots__ = ("_storage", "_index")
+
+    def __init__(self, storage: BoardStorage, idx: int):
+        """
+        Constructs a view of a field. Views are cheap and are created on demand, they should not be kept around.
+        :param storage: The storage holding the field.
+        :param idx: Index of the field in the storage.
+        """
+        self._storage = storage
+        self._index = idx
+
+    @property
+    def is_mine(self):
+        """Whether the field is a mine or empty."""
+        return self._storage.is_mine(self._index)
+
+    @property
+    def state(self):
+        """The state of the field, which can be HIDDEN, FLAGGED or REVEALED."""
+        return self._storage.state(self._index)
+
+    @state.setter
+    def state(self, value: BoardElementState):
+        self._storage.set_state(self._index, value)
+
+    @property
+    def proximity(self):
+        """The number of nearby fields with mines on them. Has a value of -1 before proper initialization and for mines."""
+        return self._storage.proximity(self._index)
+
+    @proximity.setter
+    def proximity(self, value: int):
+        validate_proximity(value)
+        self._storage.set_proximity(self._index, value)
+
+    def toggle_mine(self):
+        self._storage.toggle_mine(self._index)
+
+
+def pack_element(element: BoardElement):
+    """
+    :param element: The board element to pack.
+    :return: Returns the byte representing the given board element.
+    """
+    return ((MINE_BIT if element.is_mine else 0) | (element.state.value << STATE_SHIFT)
+            | ((element.proximity + 1) << PROXIMITY_SHIFT))
+
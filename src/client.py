@@ -0,0 +1,201 @@
+import argparse
+import asyncio
+import json
+from random import Random
+from time import perf_counter
+from src.board import MoveType
+from src.board_storage import HIDDEN_SYMBOL
+from src.server import DEFAULT_PORT, MAX_LINE_LENGTH, encode_message
+
+
+class GameClient:
+    """
+    Client of the GameServer protocol. Requests can be sent concurrently over the same connection, responses are
+    matched to them by their ids.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._pending: dict[int, asyncio.Future] = {}
+        self._update_callbacks: dict[int, list] = {}
+        self._reader_task = asyncio.create_task(self._read_responses())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = DEFAULT_PORT, path: str | None = None):
+        """
+        :param path: If given, connects to this Unix socket instead of TCP.
+        :return: Returns the connected client.
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE_LENGTH)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE_LENGTH)
+        return cls(reader, writer)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def request(self, op: str, **fields):
+        """
+        :return: Returns the response to the request.
+        :raise RuntimeError: If the server answers with an error.
+        """
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(encode_message({"id": request_id, "op": op, **fields}))
+        await self._writer.drain()
+        response = await future
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    async def new_game(self, number_of_rows: int, number_of_columns: int, number_of_mines: int,
+                       seed: int | None = None):
+        """
+        :return: Returns the id of the new session.
+        """
+        response = await self.request("new", rows=number_of_rows, columns=number_of_columns, mines=number_of_mines,
+                                      seed=seed)
+        return response["session"]
+
+    async def move(self, session: int, move_type: MoveType, row: int, col: int):
+        """
+        :return: Returns the response holding the "changes" and the "game_state".
+        """
+        return await self.request("move", session=session, type=move_type.name.lower(), row=row, column=col)
+
+    async def view(self, session: int):
+        """
+        :return: Returns the rows of the player's view of the board.
+        """
+        return (await self.request("view", session=session))["rows"]
+
+    async def watch(self, session: int, callback):
+        """
+        :param callback: Callable which is called with every update message of the session.
+        """
+        self._update_callbacks.setdefault(session, []).append(callback)
+        await self.request("watch", session=session)
+
+    async def close_game(self, session: int):
+        await self.request("close", session=session)
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        await self._reader_task
+
+    async def _read_responses(self):
+        try:
+            while line := await self._reader.readline():
+                message = json.loads(line)
+                if message.get("event") == "update":
+                    for callback in self._update_callbacks.get(message["session"], ()):
+                        callback(message)
+                    continue
+                future = self._pending.pop(message.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except ConnectionError:
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection to the game server lost."))
+            self._pending.clear()
+
+
+async def run_load_test(clients: list[GameClient], number_of_players: int, moves_per_player: int,
+                        number_of_rows: int = 16, number_of_columns: int = 16, number_of_mines: int = 40,
+                        seed: int = 0):
+    """
+    Simulates players revealing random hidden fields, spread over the given connections. A player starts a new game
+    whenever its game is over.
+    :param clients: Connected clients the players are distributed over.
+    :param number_of_players: Number of concurrent players.
+    :param moves_per_player: Number of moves every player makes.
+    :param seed: Seed of the boards and of the players' moves.
+    :return: Returns a dictionary with the number of moves and games, the throughput in moves per second and the
+    median and 99th percentile of the move latency in seconds.
+    """
+    latencies = []
+    number_of_games = 0
+
+    async def play(player: int):
+        nonlocal number_of_games
+        client = clients[player % len(clients)]
+        rng = Random(f"{seed}-{player}")
+        moves_left = moves_per_player
+        while moves_left > 0:
+            session = await client.new_game(number_of_rows, number_of_columns, number_of_mines,
+                                            seed=rng.getrandbits(32))
+            number_of_games += 1
+            order = list(range(number_of_rows * number_of_columns))
+            rng.shuffle(order)
+            revealed = set()
+            for idx in order:
+                if moves_left == 0:
+                    break
+                if idx in revealed:
+                    continue
+                start = perf_counter()
+                response = await client.move(session, MoveType.REVEAL, *divmod(idx, number_of_columns))
+                latencies.append(perf_counter() - start)
+                moves_left -= 1
+                revealed.update(index for index, symbol in response["changes"] if symbol != HIDDEN_SYMBOL)
+                if response["game_state"] in ("WIN", "LOSS"):
+                    break
+            await client.close_game(session)
+
+    start = perf_counter()
+    await asyncio.gather(*(play(player) for player in range(number_of_players)))
+    duration = perf_counter() - start
+    latencies.sort()
+    return {
+        "moves": len(latencies),
+        "games": number_of_games,
+        "duration": duration,
+        "moves_per_second": len(latencies) / duration if duration else 0.0,
+        "latency_p50": _percentile(latencies, 50),
+        "latency_p99": _percentile(latencies, 99),
+    }
+
+
+def _percentile(sorted_values: list[float], percentile: float):
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(percentile / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+async def _main(arguments: argparse.Namespace):
+    clients = [await GameClient.connect(arguments.host, arguments.port, arguments.unix)
+               for _ in range(arguments.connections)]
+    try:
+        results = await run_load_test(clients, arguments.players, arguments.moves, arguments.rows, arguments.columns,
+                                      arguments.mines, arguments.seed)
+    finally:
+        for client in clients:
+            await client.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load generator for the Minesweeper game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="Path of a Unix socket to connect to instead of TCP.")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--moves", type=int, default=20, help="Number of moves per player.")
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--columns", type=int, default=16)
+    parser.add_argument("--mines", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,77 @@
+from array import array
+from random import Random
+from src.board_storage import MINE_BIT
+
+
+def place_mines(number_of_elements: int, number_of_mines: int, rng: Random, excluded=()):
+    """
+    Places mines randomly with a partial Fisher-Yates shuffle of all board indices, in time linear in the number of
+    mines (plus the allocation of the index array). The indices left after the mines form the index of empty fields.
+    :param number_of_elements: Total number of fields on the board.
+    :param number_of_mines: Number of mines to place.
+    :param rng: Random number generator the placement is drawn from.
+    :param excluded: Indices of fields which must not contain a mine.
+    :return: Returns a tuple of the packed cells, with MINE_BIT set for every mine, and the EmptyElementIndex.
+    """
+    excluded = sorted(set(excluded))
+    number_of_candidates = number_of_elements - len(excluded)
+    if number_of_mines > number_of_candidates:
+        raise ValueError("The number of mines must not exceed the number of fields available for mines.")
+    indices = array('i')
+    start = 0
+    for idx in excluded:
+        indices.extend(range(start, idx))
+        start = idx + 1
+    indices.extend(range(start, number_of_elements))
+    indices.extend(excluded)
+    randrange = rng.randrange
+    for i in range(number_of_mines):
+        j = randrange(i, number_of_candidates)
+        indices[i], indices[j] = indices[j], indices[i]
+    cells = bytearray(number_of_elements)
+    for idx in indices[:number_of_mines]:
+        cells[idx] = MINE_BIT
+    del indices[:number_of_mines]
+    return cells, EmptyElementIndex(indices)
+
+
+class EmptyElementIndex:
+    """
+    Unordered index of the empty fields of a board, which allows moving a mine to a random empty field in constant time.
+    """
+    def __init__(self, indices: array):
+        """
+        :param indices: Array of the indices of all empty fields. It is taken over without copying.
+        """
+        self._indices = indices
+
+    @classmethod
+    def from_cells(cls, cells: bytes):
+        """
+        Builds the index by scanning the packed cells of a board.
+        :param cells: One byte per field with MINE_BIT set for every mine.
+        """
+        return cls(array('i', (idx for idx, cell in enumerate(cells) if not cell & MINE_BIT)))
+
+    def __len__(self):
+        return len(self._indices)
+
+    def relocate_mine(self, idx_mine: int, rng: Random):
+        """
+        Picks a random empty field and puts the field of the relocated mine into its place in the index.
+        :param idx_mine: Index of the field whose mine is moved, which becomes empty.
+        :param rng: Random number generator the empty field is drawn from.
+        :return: Returns the index of the empty field the mine is moved to.
+        """
+        position = rng.randrange(len(self._indices))
+        idx_empty = self._indices[position]
+        self._indices[position] = idx_mine
+        return idx_empty
+
+    def restore_mine(self, idx_mine: int, idx_empty: int):
+        """
+        Reverts relocate_mine, which is the only operation that needs to search the index.
+        :param idx_mine: Index of the field the mine is moved back to.
+        :param idx_empty: Index of the field which becomes empty again.
+        """
+        self._indices[self._indices.index(idx_mine)] = idx_empty
@@ -0,0 +1,284 @@
+import zlib
+from collections import OrderedDict
+from random import Random
+from src.board import GameState
+from src.board_element import BoardElementState
+from src.board_storage import (BoardStorage, BoardElementView, MINE_BIT, STATE_MASK, PROXIMITY_MASK, HIDDEN_BITS,
+                               FLAGGED_BITS, REVEALED_BITS, ZERO_PROXIMITY_BITS, PLAYER_VIEW_TABLE)
+from src.generation import place_mines
+from src.proximity import count_neighbouring_mines
+
+_NEIGHBOUR_OFFSETS = tuple((i, j) for i in (-1, 0, 1) for j in (-1, 0, 1) if i != 0 or j != 0)
+
+
+class InfiniteBoard:
+    """
+    Endless board, split into square chunks which are generated when they are first touched. The mines of a chunk
+    only depend on the seed and the chunk coordinates, so proximities across chunk borders can be computed from the
+    neighbouring chunks' mines without generating them fully. The field at (0, 0) and its neighbours never contain a
+    mine, so the game can be opened there.
+
+    At most max_resident_chunks chunks are kept in memory. The least recently used chunk is evicted when another one
+    is needed: untouched chunks are dropped, the states of the others are compressed into the chunk store, and the
+    chunk is regenerated from its seed on the next access. By default the chunk store keeps the progress of every
+    chunk the player has touched, so its memory grows with the explored area, by a few dozen bytes per chunk. With
+    max_stored_bytes, the chunks stored the longest ago are forgotten once the store grows larger: they return to
+    their hidden state and their revealed fields and flags are no longer counted.
+    """
+    def __init__(self, chunk_size: int = 32, mine_density: float = 0.15, seed: int = 0,
+                 max_resident_chunks: int = 256, max_cascade: int = 1000000, max_stored_bytes: int | None = None):
+        """
+        :param chunk_size: Number of rows and columns of a chunk.
+        :param mine_density: Fraction of the fields of every chunk which are mines.
+        :param seed: Seed of the board, the same seed always gives the same mines.
+        :param max_resident_chunks: Maximum number of chunks kept in memory.
+        :param max_cascade: Maximum number of fields a single reveal may uncover. Sparse boards may contain unbounded
+        regions without mines, in which case the cascade stops and the rest of the region stays hidden.
+        :param max_stored_bytes: Optional maximum size of the chunk store in bytes, unbounded by default.
+        """
+        if chunk_size < 3:
+            raise ValueError("The chunk size must be at least 3.")
+        if not 0 < mine_density < 1:
+            raise ValueError("The mine density must be between 0 and 1 (exclusive).")
+        if max_resident_chunks < 1:
+            raise ValueError("At least one chunk must be kept in memory.")
+        self._chunk_size = chunk_size
+        self._mines_per_chunk = max(1, min(round(mine_density * chunk_size * chunk_size),
+                                           chunk_size * chunk_size - 9))
+        self._seed = seed
+        self._max_resident_chunks = max_resident_chunks
+        self._max_cascade = max_cascade
+        self._resident_chunks: OrderedDict[tuple[int, int], BoardStorage] = OrderedDict()
+        self._chunk_store: OrderedDict[tuple[int, int], tuple[bytes, int, int]] = OrderedDict()
+        """Compressed state bits, number of revealed fields and number of flags of the evicted chunks, by the time
+        they have been stored."""
+        self._chunk_store_size = 0
+        self._max_stored_bytes = max_stored_bytes
+        self._mine_grids: OrderedDict[tuple[int, int], bytes] = OrderedDict()
+        self._game_state = GameState.INITIALIZED
+        self._number_of_revealed_elements = 0
+        self._number_of_flags = 0
+
+    def __getitem__(self, coordinates: tuple[int, int]):
+        """
+        :param coordinates: The (row, column) coordinates of a field, which may be negative.
+        :return: Returns a view of the field, valid until its chunk is evicted.
+        """
+        storage, idx = self._locate(*coordinates)
+        return BoardElementView(storage, idx)
+
+    @property
+    def chunk_size(self):
+        return self._chunk_size
+
+    @property
+    def seed(self):
+        return self._seed
+
+    @property
+    def game_state(self):
+        """The state of the game. The endless game can only be lost."""
+        return self._game_state
+
+    @property
+    def number_of_revealed_elements(self):
+        return self._number_of_revealed_elements
+
+    @property
+    def number_of_flags(self):
+        return self._number_of_flags
+
+    @property
+    def number_of_resident_chunks(self):
+        return len(self._resident_chunks)
+
+    @property
+    def number_of_stored_chunks(self):
+        """The number of evicted chunks whose states are kept in the compact chunk store."""
+        return len(self._chunk_store)
+
+    @property
+    def chunk_store_size(self):
+        """Total size of the compressed states in the chunk store in bytes."""
+        return self._chunk_store_size
+
+    def reveal_element(self, row: int, col: int):
+        """
+        Reveals a field, cascading through fields with zero proximity across chunk borders.
+        :param row: Row of the field.
+        :param col: Column of the field.
+        :return: Returns the set of (row, column) coordinates of the fields revealed by this call.
+        """
+        if self._game_state == GameState.INITIALIZED:
+            self._game_state = GameState.STARTED
+        storage, idx = self._locate(row, col)
+        cell = storage.cells[idx]
+        if cell & STATE_MASK == REVEALED_BITS:
+            return set()
+        self._set_revealed(storage, idx)
+        revealed = {(row, col)}
+        if cell & MINE_BIT:
+            self._game_state = GameState.LOSS
+            return revealed
+        to_expand = [(row, col)] if cell & PROXIMITY_MASK == ZERO_PROXIMITY_BITS else []
+        while to_expand and len(revealed) < self._max_cascade:
+            i, j = to_expand.pop()
+            for di, dj in _NEIGHBOUR_OFFSETS:
+                storage, idx = self._locate(i + di, j + dj)
+                cell = storage.cells[idx]
+                if cell & STATE_MASK == REVEALED_BITS:
+                    continue
+                self._set_revealed(storage, idx)
+                revealed.add((i + di, j + dj))
+                if cell & PROXIMITY_MASK == ZERO_PROXIMITY_BITS:
+                    to_expand.append((i + di, j + dj))
+        return revealed
+
+    def toggle_flag_on_element(self, row: int, col: int):
+        storage, idx = self._locate(row, col)
+        state_bits = storage.cells[idx] & STATE_MASK
+        if state_bits == HIDDEN_BITS:
+            storage.set_state(idx, BoardElementState.FLAGGED)
+            self._number_of_flags += 1
+        elif state_bits == FLAGGED_BITS:
+            storage.set_state(idx, BoardElementState.HIDDEN)
+            self._number_of_flags -= 1
+
+    def auto_reveal(self, row: int, col: int):
+        """
+        Reveals all hidden neighbours of a revealed field, if the number of flags around it equals its proximity.
+        :return: Returns the set of (row, column) coordinates of the fields revealed by this call.
+        """
+        revealed = set()
+        storage, idx = self._locate(row, col)
+        cell = storage.cells[idx]
+        if cell & STATE_MASK != REVEALED_BITS or cell & MINE_BIT:
+            return revealed
+        neighbours = [(row + di, col + dj) for di, dj in _NEIGHBOUR_OFFSETS]
+        states = [self._state_bits(i, j) for i, j in neighbours]
+        if states.count(FLAGGED_BITS) == storage.proximity(idx):
+            for (i, j), state_bits in zip(neighbours, states):
+                if state_bits == HIDDEN_BITS:
+                    revealed |= self.reveal_element(i, j)
+        return revealed
+
+    def render(self, top: int, left: int, number_of_rows: int, number_of_columns: int):
+        """
+        Renders a window of the board as the player sees it, see PLAYER_VIEW_TABLE.
+        :param top: Row of the upper left field of the window.
+        :param left: Column of the upper left field of the window.
+        :param number_of_rows: Height of the window.
+        :param number_of_columns: Width of the window.
+        :return: Returns the window as a string of newline-terminated rows.
+        """
+        size = self._chunk_size
+        lines = []
+        for row in range(top, top + number_of_rows):
+            parts = []
+            col = left
+            while col < left + number_of_columns:
+                chunk_col, local_col = divmod(col, size)
+                width = min(size - local_col, left + number_of_columns - col)
+                storage = self._chunk(row // size, chunk_col)
+                start = (row % size) * size + local_col
+                parts.append(storage.cells[start:start + width].translate(PLAYER_VIEW_TABLE).decode("ascii"))
+                col += width
+            lines.append("".join(parts) + "\n")
+        return "".join(lines)
+
+    def _set_revealed(self, storage: BoardStorage, idx: int):
+        if storage.cells[idx] & STATE_MASK == FLAGGED_BITS:
+            self._number_of_flags -= 1
+        storage.set_state(idx, BoardElementState.REVEALED)
+        self._number_of_revealed_elements += 1
+
+    def _state_bits(self, row: int, col: int):
+        storage, idx = self._locate(row, col)
+        return storage.cells[idx] & STATE_MASK
+
+    def _locate(self, row: int, col: int):
+        """
+        :return: Returns the storage of the chunk holding a field, and the index of the field in it.
+        """
+        size = self._chunk_size
+        chunk_row, local_row = divmod(row, size)
+        chunk_col, local_col = divmod(col, size)
+        return self._chunk(chunk_row, chunk_col), local_row * size + local_col
+
+    def _chunk(self, chunk_row: int, chunk_col: int):
+        key = (chunk_row, chunk_col)
+        storage = self._resident_chunks.get(key)
+        if storage is not None:
+            self._resident_chunks.move_to_end(key)
+            return storage
+        storage = self._generate_chunk(chunk_row, chunk_col)
+        stored = self._chunk_store.pop(key, None)
+        if stored is not None:
+            self._chunk_store_size -= len(stored[0])
+            storage.restore_state_bits(zlib.decompress(stored[0]))
+        if len(self._resident_chunks) >= self._max_resident_chunks:
+            self._evict()
+        self._resident_chunks[key] = storage
+        return storage
+
+    def _evict(self):
+        key, storage = self._resident_chunks.popitem(last=False)
+        if storage.number_of_hidden_elements == len(storage):
+            return
+        states = zlib.compress(storage.state_bits())
+        number_of_flags = storage.number_of_flags
+        self._chunk_store[key] = (states, len(storage) - storage.number_of_hidden_elements - number_of_flags,
+                                  number_of_flags)
+        self._chunk_store_size += len(states)
+        while self._max_stored_bytes is not None and self._chunk_store_size > self._max_stored_bytes:
+            states, number_of_revealed_elements, number_of_flags = self._chunk_store.popitem(last=False)[1]
+            self._chunk_store_size -= len(states)
+            self._number_of_revealed_elements -= number_of_revealed_elements
+            self._number_of_flags -= number_of_flags
+
+    def _generate_chunk(self, chunk_row: int, chunk_col: int):
+        """
+        :return: Returns a new storage with the chunk's mines and proximities, all fields hidden.
+        """
+        size = self._chunk_size
+        padded_size = size + 2
+        padded = bytearray(padded_size * padded_size)
+        for i in (-1, 0, 1):
+            for j in (-1, 0, 1):
+                mines = self._mine_grid(chunk_row + i, chunk_col + j)
+                rows = range(size) if i == 0 else ((size - 1,) if i < 0 else (0,))
+                cols = slice(0, size) if j == 0 else (slice(size - 1, size) if j < 0 else slice(0, 1))
+                for source_row in rows:
+                    target_row = source_row + 1 + i * size
+                    target_col = cols.start + 1 + j * size
+                    padded[target_row * padded_size + target_col:
+                           target_row * padded_size + target_col + cols.stop - cols.start] = \
+                        mines[source_row * size + cols.start:source_row * size + cols.stop]
+        counts = count_neighbouring_mines(padded, padded_size, padded_size)
+        inner_counts = b"".join(counts[row * padded_size + 1:row * padded_size + 1 + size]
+                                for row in range(1, size + 1))
+        storage = BoardStorage(cells=bytearray(self._mine_grid(chunk_row, chunk_col)))
+        storage.set_proximities(inner_counts)
+        return storage
+
+    def _mine_grid(self, chunk_row: int, chunk_col: int):
+        """
+        :return: Returns the mines of a chunk, one byte per field with MINE_BIT set for mines. Recently used grids
+        are cached, as every chunk needs the grids of its neighbours.
+        """
+        key = (chunk_row, chunk_col)
+        mines = self._mine_grids.get(key)
+        if mines is not None:
+            self._mine_grids.move_to_end(key)
+            return mines
+        size = self._chunk_size
+        excluded = [(row - chunk_row * size) * size + col - chunk_col * size
+                    for row in (-1, 0, 1) for col in (-1, 0, 1)
+                    if (row // size, col // size) == key]
+        cells, _ = place_mines(size * size, self._mines_per_chunk, Random(f"{self._seed}:{chunk_row}:{chunk_col}"),
+                               excluded)
+        mines = bytes(cells)
+        self._mine_grids[key] = mines
+        if len(self._mine_grids) > 4 * self._max_resident_chunks + 9:
+            self._mine_grids.popitem(last=False)
+        return mines
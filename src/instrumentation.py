@@ -0,0 +1,190 @@
+import cProfile
+import pstats
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from src.board import Board, BoardDelta, MoveType
+from src.board_element import BoardElementState
+from src.neighbours import NeighbourTable, ArithmeticNeighbourTable
+
+INSTRUMENTED_METHODS = ("reveal_element", "auto_reveal", "play", "calculate_proximities", "check_win_state",
+                        "swap_mine_with_empty_element")
+MOVE_METHODS = ("reveal_element", "auto_reveal", "play")
+"""Instrumented methods counted as moves, whose cascade sizes and neighbour lookups are recorded. Flag moves made
+through play() are timed, but not counted as moves, like toggle_flag_on_element."""
+
+
+class CountingNeighbourTable:
+    """
+    Neighbour table wrapping another one, which counts the calls of neighbours().
+    """
+    def __init__(self, table: NeighbourTable | ArithmeticNeighbourTable):
+        self.table = table
+        """The wrapped table."""
+        self.number_of_lookups = 0
+        self._neighbours = table.neighbours
+
+    @property
+    def number_of_rows(self):
+        return self.table.number_of_rows
+
+    @property
+    def number_of_columns(self):
+        return self.table.number_of_columns
+
+    def neighbours(self, idx: int):
+        self.number_of_lookups += 1
+        return self._neighbours(idx)
+
+
+class MethodStats:
+    """Number of calls and time spent in an instrumented method."""
+    def __init__(self):
+        self.number_of_calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def clear(self):
+        self.number_of_calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def add_call(self, duration: float):
+        self.number_of_calls += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+
+    @property
+    def mean_time(self):
+        return self.total_time / self.number_of_calls if self.number_of_calls else 0.0
+
+
+class BoardInstrumentation:
+    """
+    Opt-in instrumentation of a single board. While enabled, the instrumented methods of the board are shadowed by
+    timing wrappers set on the instance, and the board's neighbour table by a CountingNeighbourTable. Disabling removes
+    them again, so a board that is not instrumented runs exactly the same code as without this module.
+    """
+    def __init__(self, board: Board):
+        self._board = board
+        self._enabled = False
+        self.method_stats: dict[str, MethodStats] = {name: MethodStats() for name in INSTRUMENTED_METHODS}
+        self.cascade_sizes: Counter[int] = Counter()
+        """Histogram of the number of fields revealed per move."""
+        self.neighbour_lookups: Counter[int] = Counter()
+        """Histogram of the number of neighbour lookups per move."""
+        self._neighbour_table: CountingNeighbourTable | None = None
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disable()
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    def enable(self):
+        if self._enabled:
+            return
+        board = self._board
+        self._neighbour_table = CountingNeighbourTable(board._neighbours)
+        board._neighbour_table = self._neighbour_table
+        for name in INSTRUMENTED_METHODS:
+            setattr(board, name, self._wrap(name, getattr(board, name)))
+        self._enabled = True
+
+    def disable(self):
+        if not self._enabled:
+            return
+        board = self._board
+        for name in INSTRUMENTED_METHODS:
+            delattr(board, name)
+        if board._neighbour_table is self._neighbour_table:
+            board._neighbour_table = self._neighbour_table.table
+        self._enabled = False
+
+    def reset(self):
+        """Clears the statistics collected so far."""
+        for stats in self.method_stats.values():
+            stats.clear()
+        self.cascade_sizes.clear()
+        self.neighbour_lookups.clear()
+
+    def snapshot(self):
+        """
+        :return: Returns a dictionary of the statistics collected so far: calls, total, mean and maximum time in seconds
+        of every instrumented method, and histograms of the cascade sizes and neighbour lookups per move.
+        """
+        return {
+            "methods": {name: {"calls": stats.number_of_calls, "total_time": stats.total_time,
+                               "mean_time": stats.mean_time, "max_time": stats.max_time}
+                        for name, stats in self.method_stats.items()},
+            "cascade_sizes": dict(sorted(self.cascade_sizes.items())),
+            "neighbour_lookups": dict(sorted(self.neighbour_lookups.items())),
+        }
+
+    def _wrap(self, name: str, method):
+        stats = self.method_stats[name]
+        if name not in MOVE_METHODS:
+            @wraps(method)
+            def timed(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    stats.add_call(perf_counter() - start)
+            return timed
+
+        cascade_size = _delta_cascade_size if name == "play" else len
+
+        @wraps(method)
+        def timed_move(*args, **kwargs):
+            table = self._neighbour_table
+            lookups = table.number_of_lookups
+            start = perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                stats.add_call(perf_counter() - start)
+            size = cascade_size(result)
+            if size is not None:
+                self.cascade_sizes[size] += 1
+                self.neighbour_lookups[table.number_of_lookups - lookups] += 1
+            return result
+        return timed_move
+
+
+def _delta_cascade_size(delta: BoardDelta):
+    """
+    :return: Returns the number of fields revealed by a move made through play(), or None for a flag move.
+    """
+    if delta.move[0] == MoveType.FLAG:
+        return None
+    return sum(1 for change in delta.cell_changes if change.new_state == BoardElementState.REVEALED)
+
+
+@contextmanager
+def profile(path: str | None = None, sort: str = "cumulative", limit: int = 30, stream=None):
+    """
+    Profiles the enclosed code with cProfile.
+    :param path: If given, the raw statistics are dumped to this file, to be loaded with pstats.
+    :param sort: Sort key of the printed report.
+    :param limit: Number of functions in the printed report.
+    :param stream: Stream to print the report to. Without a stream and a path, no report is printed.
+    :return: Returns the profiler, whose statistics are complete when the block exits.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path is not None:
+            profiler.dump_stats(path)
+        if stream is not None:
+            pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(limit)
+
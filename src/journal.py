@@ -0,0 +1,174 @@
+import struct
+import sys
+from array import array
+from src.board import Board, BoardDelta, GameState
+
+RELOCATE_RECORD = 3
+"""Record kind of a mine moved away by swap_mine_with_empty_element, whose payload is the index of the field."""
+GAME_STATE_RECORD = 4
+"""Record kind of a game state set outside of a move, whose payload is the value of the GameState plus one."""
+_KIND_BITS = 3
+_KIND_MASK = (1 << _KIND_BITS) - 1
+MAX_JOURNAL_ELEMENTS = 1 << (32 - _KIND_BITS)
+"""Boards with more fields do not fit into the fixed-width records."""
+
+JOURNAL_MAGIC = b"MSWJ"
+JOURNAL_VERSION = 1
+_HEADER = struct.Struct("<4sHIIIQiiI")
+"""Magic, version, rows, columns, mines, seed, row and column of the safe opening (-1 if none) and number of
+records, followed by the records as little-endian 32-bit integers."""
+
+_MOVES = (Board._reveal, Board._toggle_flag, Board._auto_reveal)
+"""Unchecked move methods, indexed by the value of their MoveType."""
+
+
+class MoveJournal:
+    """
+    Journal of a game, from which any position of the game can be rebuilt. The board is determined by its parameters
+    and seed, and every change of the board is appended as a fixed-width record: the index of the field (or the game
+    state) shifted left by three bits, and the kind of the record, which is the value of the MoveType for moves.
+
+    A journal records the board returned by create_board(), and keeps the delta of every record made since, so those
+    can be undone without copying the board.
+    """
+    def __init__(self, number_of_rows: int, number_of_columns: int, number_of_mines: int, seed: int,
+                 safe_opening: tuple[int, int] | None = None, records: array | None = None):
+        """
+        :param number_of_rows: Number of rows of the board.
+        :param number_of_columns: Number of columns of the board.
+        :param number_of_mines: Number of mines on the board.
+        :param seed: Seed of the board.
+        :param safe_opening: Optional safe opening of the board, see Board.
+        :param records: Records to start with, e.g. of a journal loaded from a bug report. They are taken over without
+        copying.
+        """
+        if number_of_rows * number_of_columns > MAX_JOURNAL_ELEMENTS:
+            raise ValueError(f"Boards with more than {MAX_JOURNAL_ELEMENTS} fields can not be journaled.")
+        self.number_of_rows = number_of_rows
+        self.number_of_columns = number_of_columns
+        self.number_of_mines = number_of_mines
+        self.seed = seed
+        self.safe_opening = safe_opening
+        self._records = records if records is not None else array('I')
+        self._board: Board | None = None
+        self._deltas: list[BoardDelta] = []
+        """Deltas of the last records, which can be undone."""
+        self._random_states: list[tuple] = []
+        """States of the board's random number generator before every relocated mine that can be undone."""
+        self._undoing = False
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def records(self):
+        """The array of records. It must be treated as read-only."""
+        return self._records
+
+    @property
+    def number_of_undoable_records(self):
+        return len(self._deltas)
+
+    def create_board(self):
+        """
+        Replays the records on a new board with computed proximities, and starts recording its changes. Records made
+        by an earlier board of this journal can not be undone.
+        :return: Returns the board.
+        """
+        if self._board is not None:
+            self._board.unsubscribe(self._record)
+        board = self.replay()
+        self._board = board
+        self._deltas = []
+        self._random_states = [board._random.getstate()]
+        board.subscribe(self._record)
+        return board
+
+    def replay(self, number_of_records: int | None = None):
+        """
+        Rebuilds a position of the game on a new board, without validating the moves and without recording them.
+        :param number_of_records: Number of records to replay, all of them by default.
+        :return: Returns the board.
+        """
+        board = Board(self.number_of_rows, self.number_of_columns, self.number_of_mines, seed=self.seed,
+                      safe_opening=self.safe_opening)
+        board.calculate_proximities()
+        records = self._records if number_of_records is None else self._records[:number_of_records]
+        for record in records:
+            kind = record & _KIND_MASK
+            payload = record >> _KIND_BITS
+            if kind < RELOCATE_RECORD:
+                board._number_of_moves += 1
+                _MOVES[kind](board, payload)
+            elif kind == RELOCATE_RECORD:
+                idx_empty = board.swap_mine_with_empty_element(*board.index_to_coordinates(payload))
+                board._update_proximities_around((payload, idx_empty))
+            else:
+                board.game_state = GameState(payload - 1)
+        return board
+
+    def undo(self):
+        """
+        Reverts the last record of the board created by create_board() and drops it from the journal.
+        :return: Returns the inverse delta, which is also passed to the board's subscribers.
+        :raise IndexError: If there is no record left that can be undone.
+        """
+        if not self._deltas:
+            raise IndexError("There is no record to undo.")
+        delta = self._deltas.pop()
+        self._records.pop()
+        random_state = None
+        if delta.relocated_mine is not None:
+            self._random_states.pop()
+            random_state = self._random_states[-1]
+        self._undoing = True
+        try:
+            return self._board._undo(delta, random_state)
+        finally:
+            self._undoing = False
+
+    def to_bytes(self):
+        """
+        :return: Returns the journal in a compact binary form, e.g. to attach it to a bug report.
+        """
+        row, col = self.safe_opening if self.safe_opening is not None else (-1, -1)
+        records = array('I', self._records)
+        if sys.byteorder == "big":
+            records.byteswap()
+        return _HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, self.number_of_rows, self.number_of_columns,
+                            self.number_of_mines, self.seed, row, col, len(records)) + records.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """
+        :param data: A journal created by to_bytes.
+        :return: Returns the journal, which is not attached to a board yet.
+        :raise ValueError: If the data is not a valid journal.
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("Journal is truncated.")
+        magic, version, rows, cols, mines, seed, row, col, number_of_records = _HEADER.unpack_from(data)
+        if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+            raise ValueError("Not a move journal, or unsupported journal version.")
+        if len(data) != _HEADER.size + 4 * number_of_records:
+            raise ValueError("Journal has the wrong size for its number of records.")
+        records = array('I')
+        records.frombytes(data[_HEADER.size:])
+        if sys.byteorder == "big":
+            records.byteswap()
+        return cls(rows, cols, mines, seed, (row, col) if row >= 0 else None, records)
+
+    def _record(self, delta: BoardDelta):
+        if self._undoing:
+            return
+        if delta.move is not None:
+            move_type, row, col = delta.move
+            record = (row * self.number_of_columns + col) << _KIND_BITS | move_type.value
+        elif delta.relocated_mine is not None:
+            record = delta.relocated_mine[0] << _KIND_BITS | RELOCATE_RECORD
+            self._random_states.append(self._board._random.getstate())
+        else:
+            record = (delta.new_game_state.value + 1) << _KIND_BITS | GAME_STATE_RECORD
+        self._records.append(record)
+        self._deltas.append(delta)
+
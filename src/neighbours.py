@@ -0,0 +1,155 @@
+from array import array
+from collections import OrderedDict
+from itertools import repeat
+from operator import add
+
+NEIGHBOUR_TABLE_MAX_ELEMENTS = 1 << 18
+"""Number of fields above which neighbours are computed from the index instead of being precomputed. A precomputed
+table costs about 36 bytes per field, 36 times the storage of the board itself."""
+NEIGHBOUR_TABLE_CACHE_BYTES = 32 << 20
+"""Total size of the precomputed neighbour tables kept in memory at the same time."""
+
+
+class NeighbourTable:
+    """
+    Precomputed adjacency of all fields of a board with a given shape, in a compressed sparse row layout: the indices
+    of the neighbours of field i are targets[offsets[i]:offsets[i + 1]], in row-continuous order.
+    Tables are immutable and shared by all boards of the same shape, see neighbour_table().
+    """
+    def __init__(self, number_of_rows: int, number_of_columns: int):
+        """
+        Builds the table one row at a time. Every row is an offset copy of the first, a middle or the last row.
+        :param number_of_rows: Number of rows of the board.
+        :param number_of_columns: Number of columns of the board.
+        """
+        self._number_of_rows = number_of_rows
+        self._number_of_columns = number_of_columns
+        offsets = array('i')
+        targets = array('i')
+        row_templates = {}
+        for row in range(number_of_rows):
+            row_kind = (row == 0, row == number_of_rows - 1)
+            if row_kind not in row_templates:
+                row_templates[row_kind] = _row_template(row, number_of_rows, number_of_columns)
+            row_offsets, row_targets = row_templates[row_kind]
+            offsets.extend(map(add, row_offsets, repeat(len(targets), number_of_columns)))
+            targets.extend(map(add, row_targets, repeat(row * number_of_columns, len(row_targets))))
+        offsets.append(len(targets))
+        self._offsets = offsets
+        self._targets = targets
+
+    @property
+    def number_of_rows(self):
+        return self._number_of_rows
+
+    @property
+    def number_of_columns(self):
+        return self._number_of_columns
+
+    @property
+    def offsets(self):
+        """Array of number_of_elements + 1 offsets into targets."""
+        return self._offsets
+
+    @property
+    def targets(self):
+        """Array of the indices of the neighbours of all fields, grouped by field."""
+        return self._targets
+
+    @property
+    def nbytes(self):
+        """Size of the table's arrays in bytes."""
+        return len(self._offsets) * self._offsets.itemsize + len(self._targets) * self._targets.itemsize
+
+    def neighbours(self, idx: int):
+        """
+        :param idx: Index of a field, which is not validated.
+        :return: Returns an array of the indices of the neighbouring fields.
+        """
+        return self._targets[self._offsets[idx]:self._offsets[idx + 1]]
+
+
+class ArithmeticNeighbourTable:
+    """
+    Counterpart of NeighbourTable for large boards, which computes the neighbours of a field from its index. Only the
+    index offsets of the neighbours are stored, for each of the nine combinations of a first, middle or last row and
+    column, so the table takes constant memory whatever the size of the board.
+    """
+    def __init__(self, number_of_rows: int, number_of_columns: int):
+        self._number_of_rows = number_of_rows
+        self._number_of_columns = number_of_columns
+        self._last_row_start = (number_of_rows - 1) * number_of_columns
+        self._deltas = {}
+        for top in (False, True):
+            for bottom in (False, True):
+                for left in (False, True):
+                    for right in (False, True):
+                        self._deltas[top, bottom, left, right] = tuple(
+                            i * number_of_columns + j for i in (-1, 0, 1) for j in (-1, 0, 1)
+                            if (i != 0 or j != 0) and not (i < 0 and top) and not (i > 0 and bottom)
+                            and not (j < 0 and left) and not (j > 0 and right))
+
+    @property
+    def number_of_rows(self):
+        return self._number_of_rows
+
+    @property
+    def number_of_columns(self):
+        return self._number_of_columns
+
+    @property
+    def nbytes(self):
+        return 0
+
+    def neighbours(self, idx: int):
+        """
+        :param idx: Index of a field, which is not validated.
+        :return: Returns a list of the indices of the neighbouring fields, in row-continuous order.
+        """
+        col = idx % self._number_of_columns
+        deltas = self._deltas[idx < self._number_of_columns, idx >= self._last_row_start, col == 0,
+                              col == self._number_of_columns - 1]
+        return [idx + delta for delta in deltas]
+
+
+_cache: OrderedDict[tuple[int, int], NeighbourTable] = OrderedDict()
+_cache_bytes = 0
+
+
+def neighbour_table(number_of_rows: int, number_of_columns: int):
+    """
+    :return: Returns the NeighbourTable of the given board shape, built on first use and shared afterwards. Shapes with
+    more than NEIGHBOUR_TABLE_MAX_ELEMENTS fields get an ArithmeticNeighbourTable instead, which is cheap enough to
+    create for every board. The least recently used tables are dropped once the shared tables take more than
+    NEIGHBOUR_TABLE_CACHE_BYTES.
+    """
+    global _cache_bytes
+    if number_of_rows * number_of_columns > NEIGHBOUR_TABLE_MAX_ELEMENTS:
+        return ArithmeticNeighbourTable(number_of_rows, number_of_columns)
+    shape = (number_of_rows, number_of_columns)
+    table = _cache.get(shape)
+    if table is not None:
+        _cache.move_to_end(shape)
+        return table
+    table = NeighbourTable(number_of_rows, number_of_columns)
+    _cache[shape] = table
+    _cache_bytes += table.nbytes
+    while _cache_bytes > NEIGHBOUR_TABLE_CACHE_BYTES and len(_cache) > 1:
+        _cache_bytes -= _cache.popitem(last=False)[1].nbytes
+    return table
+
+
+def _row_template(row: int, number_of_rows: int, number_of_columns: int):
+    """
+    :return: Returns the offsets (excluding the trailing one) and the targets of a single row, relative to the start of
+    the row in targets and to the index of its first field.
+    """
+    row_offsets = []
+    row_targets = []
+    for col in range(number_of_columns):
+        row_offsets.append(len(row_targets))
+        for i in (-1, 0, 1):
+            for j in (-1, 0, 1):
+                if (i != 0 or j != 0) and 0 <= row + i < number_of_rows and 0 <= col + j < number_of_columns:
+                    row_targets.append(i * number_of_columns + col + j)
+    return row_offsets, row_targets
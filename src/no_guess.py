@@ -0,0 +1,176 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from os import cpu_count
+from random import SystemRandom
+from src.board import Board, GameState
+from src.board_element import BoardElementState
+from src.solver import Solver
+
+
+@dataclass(frozen=True)
+class NoGuessLayout:
+    """
+    A board which the Solver can clear without guessing, starting by revealing the opening field. The layout is fully
+    determined by the board parameters and its seed.
+    """
+    number_of_rows: int
+    number_of_columns: int
+    number_of_mines: int
+    seed: int
+    opening: tuple[int, int]
+
+    def create_board(self):
+        """
+        :return: Returns the board of the layout with computed proximities. The opening is not revealed yet.
+        """
+        board = Board(self.number_of_rows, self.number_of_columns, self.number_of_mines, seed=self.seed,
+                      safe_opening=self.opening)
+        board.calculate_proximities()
+        return board
+
+
+def is_solvable_without_guessing(layout: NoGuessLayout):
+    """
+    Plays the layout with the Solver alone. Besides the Solver's rules, the number of mines is used once all mines
+    are found, or when only mines are left.
+    :param layout: The layout to check.
+    :return: Returns True if all empty fields can be revealed without guessing.
+    """
+    board = layout.create_board()
+    solver = Solver(board)
+    solver.update(board.reveal_element(*layout.opening))
+    storage = board.elements
+    while board.cells_left > 0:
+        safe, mines = solver.hints()
+        if not safe:
+            if len(mines) != board.number_of_mines - storage.number_of_flags:
+                return False
+            safe = [idx for idx in range(board.number_of_elements)
+                    if board[idx].state == BoardElementState.HIDDEN and idx not in mines]
+        for idx in safe:
+            solver.update(board.reveal_element(*board.index_to_coordinates(idx)))
+        if board.game_state == GameState.LOSS:
+            return False
+    return True
+
+
+def find_no_guess_layout(number_of_rows: int, number_of_columns: int, number_of_mines: int, first_seed: int,
+                         number_of_candidates: int, opening: tuple[int, int] | None = None):
+    """
+    Checks the candidate layouts with seeds first_seed, first_seed + 1, ... in order.
+    :return: Returns the first NoGuessLayout among the candidates, or None.
+    """
+    opening = opening if opening is not None else (number_of_rows // 2, number_of_columns // 2)
+    for seed in range(first_seed, first_seed + number_of_candidates):
+        layout = NoGuessLayout(number_of_rows, number_of_columns, number_of_mines, seed, opening)
+        if is_solvable_without_guessing(layout):
+            return layout
+    return None
+
+
+def generate_no_guess_layout(number_of_rows: int, number_of_columns: int, number_of_mines: int,
+                             opening: tuple[int, int] | None = None, seed: int | None = None,
+                             workers: int | None = None, batch_size: int = 16, max_candidates: int = 100000):
+    """
+    Generates and validates candidate layouts in a pool of worker processes. Candidates are split into batches of
+    consecutive seeds, which are examined in order, so the result only depends on the seed.
+    :param number_of_rows: Number of rows of the board.
+    :param number_of_columns: Number of columns of the board.
+    :param number_of_mines: Number of mines on the board.
+    :param opening: The (row, column) coordinates of the first field to reveal, defaults to the center of the board.
+    :param seed: Seed of the first candidate. If omitted, a random seed is chosen.
+    :param workers: Number of worker processes, defaults to the number of processors. With 1 worker, the candidates
+    are checked in the calling process.
+    :param batch_size: Number of candidates a worker checks at once.
+    :param max_candidates: Number of candidates after which the search gives up.
+    :return: Returns the first NoGuessLayout found.
+    :raise RuntimeError: If none of the candidates can be solved without guessing.
+    """
+    seed = seed if seed is not None else SystemRandom().getrandbits(32)
+    batches = ((number_of_rows, number_of_columns, number_of_mines, seed + start,
+                min(batch_size, max_candidates - start), opening) for start in range(0, max_candidates, batch_size))
+    workers = workers or cpu_count() or 1
+    if workers == 1:
+        for batch in batches:
+            layout = find_no_guess_layout(*batch)
+            if layout is not None:
+                return layout
+    else:
+        # The pool is shut down without waiting, so a layout is returned without waiting for the batches in flight.
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            in_flight: deque[Future] = deque()
+            for batch in batches:
+                in_flight.append(executor.submit(find_no_guess_layout, *batch))
+                if len(in_flight) < 2 * workers:
+                    continue
+                layout = in_flight.popleft().result()
+                if layout is not None:
+                    return layout
+            for future in in_flight:
+                layout = future.result()
+                if layout is not None:
+                    return layout
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    raise RuntimeError(f"No layout without guessing found among {max_candidates} candidates.")
+
+
+class NoGuessPool:
+    """
+    Keeps pre-generated no-guess layouts for every (rows, columns, mines) preset, so a new game can start instantly.
+    Layouts taken from the pool are replaced in the background by worker processes.
+    """
+    def __init__(self, layouts_per_preset: int = 4, workers: int | None = None, seed: int | None = None,
+                 max_candidates: int = 100000):
+        """
+        :param layouts_per_preset: Number of layouts kept ready for every preset that has been used.
+        :param workers: Number of worker processes generating layouts, one layout per process at a time.
+        :param seed: Seed of the first candidate, if omitted a random seed is chosen. Every layout is searched for in
+        its own range of max_candidates seeds.
+        :param max_candidates: Number of candidates after which the search for a single layout gives up.
+        """
+        self._layouts_per_preset = layouts_per_preset
+        self._max_candidates = max_candidates
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._next_seed = seed if seed is not None else SystemRandom().getrandbits(32)
+        self._pending: dict[tuple[int, int, int], deque[Future]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def fill(self, number_of_rows: int, number_of_columns: int, number_of_mines: int):
+        """
+        Starts generating layouts for a preset until the pool holds layouts_per_preset of them.
+        """
+        preset = (number_of_rows, number_of_columns, number_of_mines)
+        pending = self._pending.setdefault(preset, deque())
+        while len(pending) < self._layouts_per_preset:
+            pending.append(self._executor.submit(generate_no_guess_layout, *preset, seed=self._next_seed, workers=1,
+                                                 max_candidates=self._max_candidates))
+            self._next_seed += self._max_candidates
+
+    def number_of_ready_layouts(self, number_of_rows: int, number_of_columns: int, number_of_mines: int):
+        pending = self._pending.get((number_of_rows, number_of_columns, number_of_mines), ())
+        return sum(1 for future in pending if future.done())
+
+    def take(self, number_of_rows: int, number_of_columns: int, number_of_mines: int):
+        """
+        Takes a layout of the given preset out of the pool and schedules its replacement. A finished layout is
+        preferred, otherwise this waits for the oldest one in progress.
+        :return: Returns a NoGuessLayout.
+        """
+        self.fill(number_of_rows, number_of_columns, number_of_mines)
+        pending = self._pending[(number_of_rows, number_of_columns, number_of_mines)]
+        future = next((future for future in pending if future.done()), pending[0])
+        pending.remove(future)
+        self.fill(number_of_rows, number_of_columns, number_of_mines)
+        return future.result()
+
+    def close(self):
+        """Stops the worker processes, discarding the layouts still being generated."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
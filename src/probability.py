@@ -0,0 +1,342 @@
+from math import comb
+from random import Random
+from time import perf_counter
+from src.board import Board
+from src.board_storage import MINE_BIT, STATE_MASK, HIDDEN_BITS, FLAGGED_BITS, REVEALED_BITS
+
+
+class ComponentSolutions:
+    """
+    Solutions of one independent component of the frontier, grouped by the number of mines they place.
+    """
+    def __init__(self, variables: tuple[int, ...], exact: bool):
+        self.variables = variables
+        """Indices of the hidden fields of the component."""
+        self.exact = exact
+        """False if the counts are estimated from sampled solutions."""
+        self.complete = True
+        """False if sampling has been stopped by the time budget, so the estimate is not memoized."""
+        self.counts: dict[int, int] = {}
+        """Number of solutions for every number of mines."""
+        self.mine_counts: dict[int, list[int]] = {}
+        """For every number of mines, the number of solutions putting a mine on each variable."""
+
+    def add(self, values: list[int]):
+        number_of_mines = sum(values)
+        self.counts[number_of_mines] = self.counts.get(number_of_mines, 0) + 1
+        mine_counts = self.mine_counts.setdefault(number_of_mines, [0] * len(values))
+        for i, value in enumerate(values):
+            mine_counts[i] += value
+
+
+class MineProbabilities:
+    """
+    Mine probabilities of all hidden, unflagged fields of a board.
+    """
+    def __init__(self, frontier: dict[int, float], unconstrained: float, exact: bool):
+        self.frontier = frontier
+        """Probabilities of the fields next to a revealed field, by index."""
+        self.unconstrained = unconstrained
+        """Probability shared by all the other hidden fields."""
+        self.exact = exact
+        """False if any component has been estimated by sampling or not solved within the time budget."""
+
+    def __getitem__(self, idx: int):
+        return self.frontier.get(idx, self.unconstrained)
+
+
+class ProbabilityEngine:
+    """
+    Computes the mine probability of every hidden field from the player's view of a board. The frontier is split into
+    independent components of constraints sharing fields, whose solutions are enumerated separately and combined with
+    the number of mines left for the other hidden fields, weighting every combination by the number of ways to place
+    those mines.
+
+    Like the Solver, the engine is incremental: it must be told about changed fields through update(). Component results
+    are memoized by their constraints, so only the components touched by the last move are solved again.
+    """
+    def __init__(self, board: Board, max_solutions: int = 100000, time_budget: float | None = None,
+                 number_of_samples: int = 2000, seed: int = 0, max_search_steps: int = 1000000):
+        """
+        :param board: The board to compute the probabilities for.
+        :param max_solutions: Maximum number of solutions enumerated for a single component. Components with more
+        solutions are estimated by sampling.
+        :param time_budget: Optional time limit in seconds for solving all components of a single probabilities()
+        call. Components are estimated by sampling once it has passed, and sampling stops at the limit too, so the
+        last components get fewer samples. The fields of a component without any sample are treated like the
+        unconstrained fields.
+        :param number_of_samples: Number of sampled solutions for an estimated component, see _sample_component.
+        :param seed: Seed of the random number generator used for sampling.
+        :param max_search_steps: Maximum number of steps of a single search, which bounds components whose search
+        backtracks a lot without finding many solutions. Components whose enumeration exceeds it are estimated by
+        sampling, and a sample whose search exceeds it ends the sampling of its component.
+        """
+        self._board = board
+        self._max_solutions = max_solutions
+        self._time_budget = time_budget
+        self._number_of_samples = number_of_samples
+        self._max_search_steps = max_search_steps
+        self._random = Random(seed)
+        self._cache: dict[tuple, ComponentSolutions] = {}
+        self._constraint_fields: set[int] = set()
+        self.reset()
+
+    def reset(self):
+        """
+        Rescans the whole board for revealed fields with hidden neighbours, e.g. after the board has been replaced.
+        """
+        cells = self._board.elements.cells
+        self._constraint_fields = set()
+        self.update(idx for idx, cell in enumerate(cells) if cell & STATE_MASK == REVEALED_BITS)
+
+    def update(self, changed_indices):
+        """
+        :param changed_indices: Iterable of the indices of fields whose state has changed since the last call.
+        """
+        cells = self._board.elements.cells
+        neighbours = self._board._neighbours.neighbours
+        constraint_fields = self._constraint_fields
+        for idx in changed_indices:
+            for field in (idx, *neighbours(idx)):
+                cell = cells[field]
+                if (cell & STATE_MASK == REVEALED_BITS and not cell & MINE_BIT
+                        and any(cells[neighbour] & STATE_MASK == HIDDEN_BITS for neighbour in neighbours(field))):
+                    constraint_fields.add(field)
+                else:
+                    constraint_fields.discard(field)
+
+    def probabilities(self):
+        """
+        :return: Returns the MineProbabilities of the current position.
+        """
+        storage = self._board.elements
+        components = self._components()
+        deadline = perf_counter() + self._time_budget if self._time_budget is not None else None
+        cache = {}
+        solutions = []
+        for key in components:
+            component = self._cache.get(key)
+            if component is None:
+                component = self._solve_component(key, deadline)
+            if component.complete:
+                cache[key] = component
+            solutions.append(component)
+        self._cache = cache
+        solved = [component for component in solutions if component.exact or component.counts]
+        number_of_frontier_fields = sum(len(component.variables) for component in solved)
+        number_of_unconstrained = storage.number_of_hidden_elements - number_of_frontier_fields
+        mines_left = storage.number_of_mines - storage.number_of_flags
+        probabilities = _combine(solved, number_of_unconstrained, mines_left)
+        if len(solved) < len(solutions):
+            probabilities.exact = False
+        return probabilities
+
+    def _components(self):
+        """
+        :return: Returns the keys of the independent components of the frontier. A key is the sorted tuple of the
+        component's constraints, each one a tuple of the sorted hidden fields and the number of mines among them.
+        """
+        cells = self._board.elements.cells
+        storage = self._board.elements
+        neighbours = self._board._neighbours.neighbours
+        constraints_by_field: dict[int, list[tuple]] = {}
+        for idx in self._constraint_fields:
+            remaining = storage.proximity(idx)
+            unknown = []
+            for neighbour in neighbours(idx):
+                state_bits = cells[neighbour] & STATE_MASK
+                if state_bits == FLAGGED_BITS:
+                    remaining -= 1
+                elif state_bits == HIDDEN_BITS:
+                    unknown.append(neighbour)
+            constraint = (tuple(unknown), remaining)
+            for field in unknown:
+                constraints_by_field.setdefault(field, []).append(constraint)
+        seen = set()
+        components = []
+        for start in constraints_by_field:
+            if start in seen:
+                continue
+            seen.add(start)
+            to_visit = [start]
+            constraints = set()
+            while to_visit:
+                for constraint in constraints_by_field[to_visit.pop()]:
+                    if constraint not in constraints:
+                        constraints.add(constraint)
+                        for field in constraint[0]:
+                            if field not in seen:
+                                seen.add(field)
+                                to_visit.append(field)
+            components.append(tuple(sorted(constraints)))
+        return components
+
+    def _solve_component(self, key: tuple, deadline: float | None):
+        variables = []
+        positions = {}
+        for fields, _ in key:
+            for field in fields:
+                if field not in positions:
+                    positions[field] = len(variables)
+                    variables.append(field)
+        constraints = [([positions[field] for field in fields], remaining) for fields, remaining in key]
+        component = ComponentSolutions(tuple(variables), exact=True)
+        number_of_solutions = 0
+        for values in _iterate_solutions(len(variables), constraints, deadline=deadline,
+                                         max_steps=self._max_search_steps):
+            number_of_solutions += 1
+            if values is None or number_of_solutions > self._max_solutions or (
+                    deadline is not None and number_of_solutions % 256 == 0 and perf_counter() > deadline):
+                return self._sample_component(tuple(variables), constraints, deadline)
+            component.add(values)
+        return component
+
+    def _sample_component(self, variables: tuple[int, ...], constraints: list, deadline: float | None):
+        """
+        Estimates a component from the first solutions of randomised depth-first searches. These are not uniform
+        samples of the solutions: a search favours the solutions in the less constrained parts of the search tree, so
+        the estimated probabilities are biased, which is why they are flagged as not exact. Fields which are mines or
+        safe in every solution are estimated correctly.
+        :param deadline: Optional perf_counter() value at which sampling stops.
+        """
+        component = ComponentSolutions(variables, exact=False)
+        for _ in range(self._number_of_samples):
+            if deadline is not None and perf_counter() > deadline:
+                component.complete = False
+                break
+            solution = next(_iterate_solutions(len(variables), constraints, self._random, deadline,
+                                               self._max_search_steps), None)
+            if solution is None:
+                component.complete = deadline is None or perf_counter() <= deadline
+                break
+            component.add(solution)
+        return component
+
+
+def _iterate_solutions(number_of_variables: int, constraints: list, rng: Random | None = None,
+                       deadline: float | None = None, max_steps: int | None = None):
+    """
+    Depth-first search over the assignments of mines to the variables, pruning as soon as a constraint can no longer be
+    met. The search is iterative, so components of any size are fine.
+    :param number_of_variables: Number of variables.
+    :param constraints: List of (variable positions, number of mines) tuples.
+    :param rng: If given, values are tried in random order, which makes the first solutions samples of the solution
+    space.
+    :param deadline: Optional perf_counter() value at which the search stops early.
+    :param max_steps: Optional maximum number of steps, i.e. assignments and backtracks, after which the search stops
+    early.
+    :return: Returns an iterator of solutions, lists of 0/1 values. The same list is reused for all solutions. A search
+    which stops early yields None as its last item.
+    """
+    needed = [remaining for _, remaining in constraints]
+    free = [len(positions) for positions, _ in constraints]
+    constraints_of_variable = [[] for _ in range(number_of_variables)]
+    for constraint_id, (positions, _) in enumerate(constraints):
+        for position in positions:
+            constraints_of_variable[position].append(constraint_id)
+    values = [0] * number_of_variables
+
+    def options():
+        order = [1, 0]
+        if rng is not None:
+            rng.shuffle(order)
+        return order
+
+    def assign(variable: int, value: int):
+        for constraint_id in constraints_of_variable[variable]:
+            if not 0 <= needed[constraint_id] - value <= free[constraint_id] - 1:
+                return False
+        values[variable] = value
+        for constraint_id in constraints_of_variable[variable]:
+            needed[constraint_id] -= value
+            free[constraint_id] -= 1
+        return True
+
+    def unassign(variable: int):
+        for constraint_id in constraints_of_variable[variable]:
+            needed[constraint_id] += values[variable]
+            free[constraint_id] += 1
+
+    choices = [[] for _ in range(number_of_variables)]
+    depth = 0
+    steps = 0
+    if number_of_variables:
+        choices[0] = options()
+    while True:
+        steps += 1
+        if (max_steps is not None and steps > max_steps) or (
+                deadline is not None and steps % 4096 == 0 and perf_counter() > deadline):
+            yield None
+            return
+        if depth == number_of_variables:
+            yield values
+            depth -= 1
+            if depth < 0:
+                return
+            unassign(depth)
+        elif choices[depth]:
+            if assign(depth, choices[depth].pop()):
+                depth += 1
+                if depth < number_of_variables:
+                    choices[depth] = options()
+        else:
+            depth -= 1
+            if depth < 0:
+                return
+            unassign(depth)
+
+
+def _combine(components: list[ComponentSolutions], number_of_unconstrained: int, mines_left: int):
+    """
+    Weights every combination of per-component mine numbers by the number of ways to place the remaining mines on the
+    unconstrained fields, using convolutions of the components' solution counts.
+    """
+    def convolve(a: dict[int, int], b: dict[int, int]):
+        result = {}
+        for i, count_a in a.items():
+            for j, count_b in b.items():
+                result[i + j] = result.get(i + j, 0) + count_a * count_b
+        return result
+
+    ways_cache = {}
+
+    def ways(mines_in_frontier: int):
+        # The binomial coefficients of large boards are huge integers, so every one is computed only once.
+        result = ways_cache.get(mines_in_frontier)
+        if result is None:
+            mines_outside = mines_left - mines_in_frontier
+            result = (comb(number_of_unconstrained, mines_outside) if 0 <= mines_outside <= number_of_unconstrained
+                      else 0)
+            ways_cache[mines_in_frontier] = result
+        return result
+
+    prefixes = [{0: 1}]
+    for component in components:
+        prefixes.append(convolve(prefixes[-1], component.counts))
+    suffixes = [{0: 1}]
+    for component in reversed(components):
+        suffixes.append(convolve(suffixes[-1], component.counts))
+    suffixes.reverse()
+    total = prefixes[-1]
+    weight = sum(count * ways(mines) for mines, count in total.items())
+    exact = all(component.exact for component in components)
+    if weight == 0:
+        # The flags contradict the proximity numbers, so fall back to a uniform distribution.
+        number_of_hidden = number_of_unconstrained + sum(len(component.variables) for component in components)
+        uniform = max(0, min(mines_left, number_of_hidden)) / number_of_hidden if number_of_hidden else 0.0
+        return MineProbabilities({field: uniform for component in components for field in component.variables},
+                                 uniform, exact=False)
+    frontier = {}
+    for i, component in enumerate(components):
+        others = convolve(prefixes[i], suffixes[i + 1])
+        for mines, mine_counts in component.mine_counts.items():
+            weight_of_mines = sum(count * ways(mines + other_mines) for other_mines, count in others.items())
+            for field, mine_count in zip(component.variables, mine_counts):
+                frontier[field] = frontier.get(field, 0) + mine_count * weight_of_mines
+    for field in frontier:
+        frontier[field] /= weight
+    unconstrained = 0.0
+    if number_of_unconstrained:
+        expected_mines_outside = sum(count * ways(mines) * (mines_left - mines) for mines, count in total.items())
+        unconstrained = expected_mines_outside / weight / number_of_unconstrained
+    return MineProbabilities(frontier, unconstrained, exact)
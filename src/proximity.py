@@ -0,0 +1,50 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def count_neighbouring_mines(mines: bytes, number_of_rows: int, number_of_columns: int):
+    """
+    Counts the mines around every field of a board in a single pass over the whole mine grid.
+    :param mines: One byte per field in a row-continuous manner, 1 for mines and 0 for empty fields.
+    :param number_of_rows: Number of rows of the grid.
+    :param number_of_columns: Number of columns of the grid.
+    :return: Returns a bytes object holding the number of neighbouring mines (0..8) for every field.
+    """
+    if numpy is not None:
+        return _count_with_numpy(mines, number_of_rows, number_of_columns)
+    return _count_with_shifted_rows(mines, number_of_rows, number_of_columns)
+
+
+def _count_with_numpy(mines: bytes, number_of_rows: int, number_of_columns: int):
+    grid = numpy.frombuffer(bytes(mines), dtype=numpy.uint8).reshape(number_of_rows, number_of_columns)
+    padded = numpy.pad(grid, 1)
+    counts = numpy.zeros((number_of_rows, number_of_columns), dtype=numpy.uint8)
+    for i in range(3):
+        for j in range(3):
+            if i != 1 or j != 1:
+                counts += padded[i:i + number_of_rows, j:j + number_of_columns]
+    return counts.tobytes()
+
+
+def _count_with_shifted_rows(mines: bytes, number_of_rows: int, number_of_columns: int):
+    """
+    Pure Python fallback. The grid is padded with a zero border and read as one large little-endian integer, in which
+    every byte is a lane holding a single field. Adding the grid shifted by one field and by one padded row in every
+    direction sums the neighbours of all fields at once. A lane never exceeds 8, so no carry crosses into another lane.
+    """
+    width = number_of_columns + 2
+    zero_row = bytes(width)
+    padded_rows = [zero_row]
+    for start in range(0, number_of_rows * number_of_columns, number_of_columns):
+        padded_rows.append(b"\x00" + mines[start:start + number_of_columns] + b"\x00")
+    padded_rows.append(zero_row)
+    padded = b"".join(padded_rows)
+    grid = int.from_bytes(padded, "little")
+    total = 0
+    for shift in (1, width - 1, width, width + 1):
+        total += (grid << (8 * shift)) + (grid >> (8 * shift))
+    counts = total.to_bytes(len(padded), "little")
+    return b"".join(counts[row * width + 1:row * width + 1 + number_of_columns]
+                    for row in range(1, number_of_rows + 1))
@@ -0,0 +1,94 @@
+from src.board_storage import MINE_BIT, PROXIMITY_MASK, PROXIMITY_SHIFT, PLAYER_VIEW_TABLE
+
+SOLUTION_VIEW = "solution"
+"""View showing every field as a mine ('m') or its proximity number."""
+PLAYER_VIEW = "player"
+"""View showing the board as the player sees it, see PLAYER_VIEW_TABLE."""
+
+_WIDE = 0
+"""Symbol of a field whose solution symbol is wider than one character, i.e. an unassigned proximity (-1)."""
+
+
+def _solution_symbol(cell: int):
+    if cell & MINE_BIT:
+        return "m"
+    return str(((cell & PROXIMITY_MASK) >> PROXIMITY_SHIFT) - 1)
+
+
+_SOLUTION_CELL_STRINGS = tuple(f" {_solution_symbol(cell)} *" for cell in range(256))
+_SOLUTION_VIEW_TABLE = bytes(ord(_solution_symbol(cell)) if len(_solution_symbol(cell)) == 1 else _WIDE
+                             for cell in range(256))
+_VIEW_TABLES = {SOLUTION_VIEW: _SOLUTION_VIEW_TABLE, PLAYER_VIEW: PLAYER_VIEW_TABLE}
+
+
+class BoardRenderer:
+    """
+    Renders a board as text, with every field framed by asterisks like Board.__str__. The string of every row is cached
+    together with the cells it has been rendered from, and only the rows whose cells differ from the cached ones are
+    rendered again, so rendering a board after a move costs a comparison of the cells and the changed rows.
+    """
+    def __init__(self, board, view: str = SOLUTION_VIEW):
+        """
+        :param board: The board to render.
+        :param view: SOLUTION_VIEW or PLAYER_VIEW.
+        """
+        if view not in _VIEW_TABLES:
+            raise ValueError(f"Unknown view {view!r}, expected {SOLUTION_VIEW!r} or {PLAYER_VIEW!r}.")
+        self._board = board
+        self._view = view
+        self._table = _VIEW_TABLES[view]
+        columns = board.number_of_columns
+        self._separator = "*" * (columns * 4 + 1) + "\n"
+        self._row_template = ("*" + " ? *" * columns + "\n").encode("ascii")
+        self._row_cells: list[bytes | None] = [None] * board.number_of_rows
+        self._row_strings: list[str] = [""] * board.number_of_rows
+        self.number_of_rendered_rows = 0
+        """Number of rows rendered since the renderer has been created, cached rows excluded."""
+
+    @property
+    def view(self):
+        return self._view
+
+    def render(self):
+        """
+        :return: Returns the whole board as a single string.
+        """
+        cells = self._board.elements.cells
+        columns = self._board.number_of_columns
+        row_cells, row_strings = self._row_cells, self._row_strings
+        for row in range(len(row_cells)):
+            current = cells[row * columns:(row + 1) * columns]
+            if current != row_cells[row]:
+                row_cells[row] = bytes(current)
+                row_strings[row] = self._render_row(current)
+        return self._separator + "".join(row_strings)
+
+    def stream(self):
+        """
+        Renders the board row by row without caching, for boards too large to hold their text in memory.
+        :return: Returns an iterator of strings, which concatenated give the result of render().
+        """
+        cells = self._board.elements.cells
+        columns = self._board.number_of_columns
+        yield self._separator
+        for row in range(self._board.number_of_rows):
+            yield self._render_row(cells[row * columns:(row + 1) * columns])
+
+    def write(self, stream):
+        """
+        Writes the board to a text stream, see stream().
+        """
+        for text in self.stream():
+            stream.write(text)
+
+    def _render_row(self, cells: bytes):
+        """
+        :return: Returns the line of a row of fields, followed by the separator line.
+        """
+        self.number_of_rendered_rows += 1
+        symbols = cells.translate(self._table)
+        if self._view == SOLUTION_VIEW and _WIDE in symbols:
+            return "*" + "".join(_SOLUTION_CELL_STRINGS[cell] for cell in cells) + "\n" + self._separator
+        line = bytearray(self._row_template)
+        line[2:len(line) - 1:4] = symbols
+        return line.decode("ascii") + self._separator
@@ -0,0 +1,306 @@
+import argparse
+import asyncio
+import json
+import logging
+import struct
+from time import monotonic
+from src.board import Board, BoardDelta, GameState, MoveType
+from src.board_storage import PLAYER_VIEW_TABLE
+
+DEFAULT_PORT = 8765
+MAX_LINE_LENGTH = 1 << 16
+"""Maximum length of a request line in bytes."""
+DEFAULT_MAX_ELEMENTS = 250000
+"""Default maximum number of fields of a board. Larger boards would block the event loop while they are set up."""
+
+logger = logging.getLogger(__name__)
+
+
+class GameSession:
+    """
+    A game hosted by the server. Idle sessions keep only the binary snapshot of their board.
+    """
+    __slots__ = ("board", "snapshot", "last_used", "watchers", "pending_changes", "flush_scheduled")
+
+    def __init__(self, board: Board):
+        self.board: Board | None = board
+        self.snapshot: bytes | None = None
+        self.last_used = monotonic()
+        self.watchers: set[asyncio.StreamWriter] = set()
+        """Connections receiving the updates of the session."""
+        self.pending_changes: dict[int, str] = {}
+        """Symbols of the fields changed since the last update was sent, by index."""
+        self.flush_scheduled = False
+
+
+class GameServer:
+    """
+    Hosts many games over a line-delimited JSON protocol on TCP or Unix sockets. Every request is a JSON object on a
+    line of its own with an "op" and an optional "id", which is copied into the response:
+
+    - {"op": "new", "rows": 9, "columns": 9, "mines": 10, "seed": 1}: starts a game with at most max_elements fields.
+      The seed is optional and must be an integer between 0 and 2^64 - 1. The response holds the "session" id and the
+      "seed".
+    - {"op": "move", "session": 1, "type": "reveal", "row": 0, "column": 0}: makes a move of type "reveal", "flag" or
+      "chord". The first revealed field is never a mine. The response holds the "changes" as [index, symbol] pairs,
+      with the symbols of the player's view (see PLAYER_VIEW_TABLE), and the "game_state".
+    - {"op": "view", "session": 1}: the response holds the player's view as a list of "rows".
+    - {"op": "watch", "session": 1}: the connection receives {"event": "update", ...} messages with the changes made to
+      the session by any connection. Changes are coalesced, so at most one update per session is sent per iteration of
+      the event loop, holding only the latest symbol of every changed field.
+
+    Sizes, mine numbers, coordinates and seeds must be JSON integers.
+    - {"op": "close", "session": 1}: ends a game.
+    - {"op": "stats"}: the response holds the number of sessions and of evicted sessions.
+
+    Failed requests are answered with an "error" message. Sessions which have not been used for idle_timeout seconds
+    are evicted to a binary snapshot and restored on their next request.
+    """
+    def __init__(self, idle_timeout: float = 300.0, max_sessions: int = 100000,
+                 max_elements: int = DEFAULT_MAX_ELEMENTS):
+        """
+        :param idle_timeout: Seconds after which an unused session is evicted to a snapshot.
+        :param max_sessions: Maximum number of sessions, including evicted ones.
+        :param max_elements: Maximum number of fields of a board.
+        """
+        self._idle_timeout = idle_timeout
+        self._max_sessions = max_sessions
+        self._max_elements = max_elements
+        self._sessions: dict[int, GameSession] = {}
+        self._next_session_id = 1
+        self._servers: list[asyncio.AbstractServer] = []
+        self._eviction_task: asyncio.Task | None = None
+
+    @property
+    def number_of_sessions(self):
+        return len(self._sessions)
+
+    @property
+    def number_of_evicted_sessions(self):
+        return sum(1 for session in self._sessions.values() if session.board is None)
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+        """
+        :return: Returns the asyncio server, e.g. to look up the port it is bound to if port 0 is given.
+        """
+        server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_LINE_LENGTH)
+        return self._add_server(server)
+
+    async def start_unix(self, path: str):
+        server = await asyncio.start_unix_server(self._handle_connection, path, limit=MAX_LINE_LENGTH)
+        return self._add_server(server)
+
+    async def close(self):
+        """Stops accepting connections and stops the eviction of idle sessions."""
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+            self._eviction_task = None
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+
+    def evict_idle_sessions(self, now: float | None = None):
+        """
+        Replaces the boards of the sessions which have been idle for idle_timeout seconds by their snapshots. A session
+        whose board cannot be serialized is logged, stays in memory and is tried again after another idle_timeout.
+        :param now: The current time of time.monotonic, for testing.
+        """
+        now = now if now is not None else monotonic()
+        for session_id, session in self._sessions.items():
+            if session.board is not None and now - session.last_used >= self._idle_timeout:
+                try:
+                    session.snapshot = session.board.to_bytes()
+                except (ValueError, TypeError, struct.error):
+                    logger.exception("Session %d could not be evicted.", session_id)
+                    session.last_used = now
+                    continue
+                session.board = None
+
+    def handle_request(self, request: dict, connection: asyncio.StreamWriter | None = None):
+        """
+        Processes a single request. Requests are processed synchronously on the event loop, so the requests of all
+        connections playing the same session never interleave.
+        :param request: The decoded request.
+        :param connection: The connection the request has been received on, needed for "watch".
+        :return: Returns the response.
+        """
+        response = {"id": request.get("id")}
+        try:
+            response.update(self._dispatch(request, connection))
+        except (KeyError, ValueError, TypeError, IndexError) as error:
+            response["error"] = f"{type(error).__name__}: {error}"
+        return response
+
+    def _add_server(self, server: asyncio.AbstractServer):
+        self._servers.append(server)
+        if self._eviction_task is None:
+            self._eviction_task = asyncio.create_task(self._evict_periodically())
+        return server
+
+    async def _evict_periodically(self):
+        while True:
+            await asyncio.sleep(max(self._idle_timeout / 4, 0.01))
+            self.evict_idle_sessions()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("The request must be a JSON object.")
+                except ValueError as error:
+                    response = {"id": None, "error": f"Invalid request: {error}"}
+                else:
+                    response = self.handle_request(request, writer)
+                writer.write(encode_message(response))
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # Connection lost, or a request line longer than MAX_LINE_LENGTH.
+            pass
+        finally:
+            for session in self._sessions.values():
+                session.watchers.discard(writer)
+            writer.close()
+
+    def _dispatch(self, request: dict, connection: asyncio.StreamWriter | None):
+        op = request.get("op")
+        if op == "new":
+            return self._new_game(request)
+        if op == "stats":
+            return {"sessions": self.number_of_sessions, "evicted": self.number_of_evicted_sessions}
+        session_id = request.get("session")
+        session = self._sessions.get(session_id) if isinstance(session_id, int) else None
+        if session is None:
+            raise KeyError(f"Unknown session {session_id}")
+        session.last_used = monotonic()
+        if op == "close":
+            del self._sessions[session_id]
+            return {"session": session_id}
+        board = self._resident_board(session_id, session)
+        if op == "move":
+            return self._move(board, request)
+        if op == "view":
+            view = board.elements.cells.translate(PLAYER_VIEW_TABLE).decode("ascii")
+            columns = board.number_of_columns
+            return {"rows": [view[start:start + columns] for start in range(0, len(view), columns)]}
+        if op == "watch":
+            if connection is None:
+                raise ValueError("Watching requires a connection.")
+            session.watchers.add(connection)
+            return {"session": session_id}
+        raise ValueError(f"Unknown op {op!r}")
+
+    def _new_game(self, request: dict):
+        if len(self._sessions) >= self._max_sessions:
+            raise ValueError("Too many sessions.")
+        number_of_rows, number_of_columns = _integer(request, "rows"), _integer(request, "columns")
+        if number_of_rows * number_of_columns > self._max_elements:
+            raise ValueError(f"Boards are limited to {self._max_elements} fields.")
+        seed = request.get("seed")
+        if seed is not None and (_integer(request, "seed") < 0 or seed >= 1 << 64):
+            raise ValueError("The seed must be an integer between 0 and 2^64 - 1.")
+        board = Board(number_of_rows, number_of_columns, _integer(request, "mines"), seed=seed)
+        board.calculate_proximities()
+        session_id = self._next_session_id
+        self._next_session_id += 1
+        session = GameSession(board)
+        self._sessions[session_id] = session
+        self._subscribe(session_id, session)
+        return {"session": session_id, "seed": board.seed}
+
+    def _resident_board(self, session_id: int, session: GameSession):
+        """
+        :return: Returns the board of a session, restoring it from its snapshot if it has been evicted.
+        """
+        if session.board is None:
+            session.board = Board.from_bytes(session.snapshot)
+            session.snapshot = None
+            self._subscribe(session_id, session)
+        return session.board
+
+    def _subscribe(self, session_id: int, session: GameSession):
+        def collect(delta: BoardDelta):
+            if not session.watchers:
+                return
+            cells = session.board.elements.cells
+            for change in delta.cell_changes:
+                session.pending_changes[change.index] = chr(PLAYER_VIEW_TABLE[cells[change.index]])
+            if not session.flush_scheduled:
+                session.flush_scheduled = True
+                asyncio.get_running_loop().call_soon(self._flush, session_id, session)
+
+        session.board.subscribe(collect)
+
+    def _flush(self, session_id: int, session: GameSession):
+        session.flush_scheduled = False
+        game_state = session.board.game_state.name if session.board is not None else None
+        update = encode_message({"event": "update", "session": session_id,
+                                 "changes": list(session.pending_changes.items()), "game_state": game_state})
+        session.pending_changes.clear()
+        for watcher in session.watchers:
+            if not watcher.is_closing():
+                watcher.write(update)
+
+    @staticmethod
+    def _move(board: Board, request: dict):
+        move_type = MoveType[str(request["type"]).upper()]
+        row, col = _integer(request, "row"), _integer(request, "column")
+        if board.game_state in (GameState.WIN, GameState.LOSS):
+            raise ValueError("The game is over.")
+        if move_type == MoveType.REVEAL and board.game_state == GameState.INITIALIZED:
+            if board.swap_mine_with_empty_element(row, col) is not None:
+                board.calculate_proximities()
+            board.game_state = GameState.STARTED
+        delta = board.play(move_type, row, col)
+        board.check_win_state()
+        cells = board.elements.cells
+        return {"changes": [(change.index, chr(PLAYER_VIEW_TABLE[cells[change.index]]))
+                            for change in delta.cell_changes],
+                "game_state": board.game_state.name}
+
+
+def _integer(request: dict, name: str):
+    """
+    :return: Returns a field of a request which must be an integer. Floats are rejected rather than truncated.
+    :raise KeyError: If the field is missing.
+    :raise ValueError: If the field is not an integer.
+    """
+    value = request[name]
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"{name!r} must be an integer, got {value!r}.")
+    return value
+
+
+def encode_message(message: dict):
+    """
+    :return: Returns the message as a compact JSON line.
+    """
+    return json.dumps(message, separators=(",", ":")).encode("ascii") + b"\n"
+
+
+async def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, path: str | None = None,
+                idle_timeout: float = 300.0, max_elements: int = DEFAULT_MAX_ELEMENTS):
+    """
+    Runs a GameServer until cancelled.
+    :param path: If given, the server listens on this Unix socket instead of TCP.
+    """
+    game_server = GameServer(idle_timeout=idle_timeout, max_elements=max_elements)
+    server = await (game_server.start_unix(path) if path is not None else game_server.start_tcp(host, port))
+    try:
+        await server.serve_forever()
+    finally:
+        await game_server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Minesweeper game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="Path of a Unix socket to listen on instead of TCP.")
+    parser.add_argument("--idle-timeout", type=float, default=300.0)
+    parser.add_argument("--max-elements", type=int, default=DEFAULT_MAX_ELEMENTS,
+                        help="Maximum number of fields of a board.")
+    arguments = parser.parse_args()
+    asyncio.run(serve(arguments.host, arguments.port, arguments.unix, arguments.idle_timeout, arguments.max_elements))
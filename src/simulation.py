@@ -0,0 +1,255 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from random import Random
+from time import perf_counter
+from src.board import Board, GameState, MoveType
+from src.board_element import BoardElementState
+from src.probability import ProbabilityEngine
+from src.solver import Solver
+
+
+class RandomPolicy:
+    """
+    Move policy revealing hidden, unflagged fields in a random order.
+    A move policy is a picklable callable, which takes a board and a random number generator and returns a generator
+    of (MoveType, row, column) moves. The generator is advanced lazily, so every move can depend on the outcome of the
+    previous ones, and the set of indices changed by a move is sent into it. The game ends when it is won or lost, or
+    when the generator is exhausted.
+    """
+    def __call__(self, board: Board, rng: Random):
+        order = list(range(board.number_of_elements))
+        rng.shuffle(order)
+        for idx in order:
+            if board[idx].state == BoardElementState.HIDDEN:
+                yield (MoveType.REVEAL, *board.index_to_coordinates(idx))
+
+
+class SolverPolicy:
+    """
+    Move policy revealing the fields the Solver finds certainly safe. When there are none, it guesses either a random
+    field which is not certainly a mine, or the field with the lowest mine probability.
+    """
+    def __init__(self, use_probabilities: bool = False):
+        """
+        :param use_probabilities: Whether to guess with the ProbabilityEngine instead of randomly.
+        """
+        self.use_probabilities = use_probabilities
+
+    def __call__(self, board: Board, rng: Random):
+        solver = Solver(board)
+        engine = ProbabilityEngine(board, seed=rng.getrandbits(32)) if self.use_probabilities else None
+        while True:
+            safe, mines = solver.hints()
+            if safe:
+                idx = min(safe)
+            else:
+                candidates = [idx for idx in range(board.number_of_elements)
+                              if board[idx].state == BoardElementState.HIDDEN and idx not in mines]
+                if not candidates:
+                    return
+                if engine is not None:
+                    probabilities = engine.probabilities()
+                    lowest = min(probabilities[idx] for idx in candidates)
+                    candidates = [idx for idx in candidates if probabilities[idx] == lowest]
+                idx = rng.choice(candidates)
+            changed = yield (MoveType.REVEAL, *board.index_to_coordinates(idx))
+            solver.update(changed)
+            if engine is not None:
+                engine.update(changed)
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """The outcome of a single simulated game."""
+    seed: int
+    won: bool
+    number_of_moves: int
+    cascade_sizes: tuple[int, ...]
+    """Number of fields revealed by every reveal or chord move."""
+    duration: float
+    """Wall-clock time of the game in seconds."""
+
+
+class SimulationStats:
+    """
+    Aggregated results of simulated games. Everything except the durations only depends on the seeds of the games.
+    """
+    def __init__(self):
+        self.number_of_games = 0
+        self.number_of_wins = 0
+        self.moves_per_game: Counter[int] = Counter()
+        """Histogram of the number of moves per game."""
+        self.cascade_sizes: Counter[int] = Counter()
+        """Histogram of the number of fields revealed per reveal or chord move."""
+        self.durations: list[float] = []
+        """Wall-clock time of every game in seconds."""
+
+    def add_game(self, result: GameResult):
+        self.number_of_games += 1
+        self.number_of_wins += result.won
+        self.moves_per_game[result.number_of_moves] += 1
+        self.cascade_sizes.update(result.cascade_sizes)
+        self.durations.append(result.duration)
+
+    def merge(self, other: "SimulationStats"):
+        self.number_of_games += other.number_of_games
+        self.number_of_wins += other.number_of_wins
+        self.moves_per_game.update(other.moves_per_game)
+        self.cascade_sizes.update(other.cascade_sizes)
+        self.durations.extend(other.durations)
+
+    @property
+    def win_rate(self):
+        return self.number_of_wins / self.number_of_games if self.number_of_games else 0.0
+
+    @property
+    def mean_moves_per_game(self):
+        return _histogram_mean(self.moves_per_game)
+
+    @property
+    def mean_cascade_size(self):
+        return _histogram_mean(self.cascade_sizes)
+
+    @property
+    def max_cascade_size(self):
+        return max(self.cascade_sizes, default=0)
+
+    def duration_percentile(self, percentile: float):
+        """
+        :param percentile: Percentile between 0 and 100.
+        :return: Returns the game duration at the given percentile (nearest rank), or 0.0 if no game has been played.
+        """
+        if not self.durations:
+            return 0.0
+        durations = sorted(self.durations)
+        rank = max(0, min(len(durations) - 1, round(percentile / 100 * len(durations) + 0.5) - 1))
+        return durations[rank]
+
+    def summary(self):
+        """
+        :return: Returns a dictionary of the main statistics.
+        """
+        return {
+            "games": self.number_of_games,
+            "win_rate": self.win_rate,
+            "mean_moves_per_game": self.mean_moves_per_game,
+            "mean_cascade_size": self.mean_cascade_size,
+            "max_cascade_size": self.max_cascade_size,
+            "duration_p50": self.duration_percentile(50),
+            "duration_p90": self.duration_percentile(90),
+            "duration_p99": self.duration_percentile(99),
+        }
+
+
+def play_game(number_of_rows: int, number_of_columns: int, number_of_mines: int, seed: int, policy=RandomPolicy(),
+              max_moves: int | None = None):
+    """
+    Plays a single game through the Board API. The first revealed field is never a mine, as in the real game: a mine
+    there is swapped away and the proximities are recomputed. Once all empty fields are revealed, the remaining fields
+    are flagged, so that check_win_state reports the win.
+    :param number_of_rows: Number of rows of the board.
+    :param number_of_columns: Number of columns of the board.
+    :param number_of_mines: Number of mines on the board.
+    :param seed: Seed of the board. The random number generator handed to the policy is derived from it.
+    :param policy: Move policy, see RandomPolicy.
+    :param max_moves: Optional limit on the number of moves, after which the game counts as not won.
+    :return: Returns the GameResult.
+    """
+    start = perf_counter()
+    board = Board(number_of_rows, number_of_columns, number_of_mines, seed=seed)
+    board.calculate_proximities()
+    number_of_moves = 0
+    cascade_sizes = []
+    moves = policy(board, Random(f"policy-{seed}"))
+    changed = None
+    while max_moves is None or number_of_moves < max_moves:
+        try:
+            move_type, row, col = moves.send(changed)
+        except StopIteration:
+            break
+        number_of_moves += 1
+        if move_type == MoveType.REVEAL:
+            if board.game_state == GameState.INITIALIZED and board[row, col].is_mine:
+                board.swap_mine_with_empty_element(row, col)
+                board.calculate_proximities()
+            board.game_state = GameState.STARTED
+            changed = board.reveal_element(row, col)
+            cascade_sizes.append(len(changed))
+        elif move_type == MoveType.FLAG:
+            board.toggle_flag_on_element(row, col)
+            changed = {board.coordinates_to_index(row, col)}
+        else:
+            changed = board.auto_reveal(row, col)
+            cascade_sizes.append(len(changed))
+        if board.game_state == GameState.LOSS:
+            break
+        if board.cells_left == 0:
+            _flag_remaining_mines(board)
+        board.check_win_state()
+        if board.game_state == GameState.WIN:
+            break
+    return GameResult(seed, board.game_state == GameState.WIN, number_of_moves, tuple(cascade_sizes),
+                      perf_counter() - start)
+
+
+def simulate(number_of_games: int, number_of_rows: int, number_of_columns: int, number_of_mines: int, seed: int = 0,
+             policy=RandomPolicy(), workers: int | None = None, batch_size: int = 100, max_moves: int | None = None):
+    """
+    Plays seeded games in a pool of worker processes and streams back the aggregated results. Game i is played with
+    seed + i and games are split into fixed batches, which are merged in order, so the results (apart from the
+    durations) are the same for any number of workers.
+    :param number_of_games: Number of games to play.
+    :param number_of_rows: Number of rows of the boards.
+    :param number_of_columns: Number of columns of the boards.
+    :param number_of_mines: Number of mines on the boards.
+    :param seed: Seed of the first game.
+    :param policy: Picklable move policy, see RandomPolicy.
+    :param workers: Number of worker processes, defaults to the number of processors. With 1 worker, the games are
+    played in the calling process.
+    :param batch_size: Number of games a worker plays before reporting back.
+    :param max_moves: Optional limit on the number of moves per game.
+    :return: Returns an iterator of SimulationStats, holding the running totals after every batch.
+    """
+    batches = [(seed + start, min(batch_size, number_of_games - start), number_of_rows, number_of_columns,
+                number_of_mines, policy, max_moves) for start in range(0, number_of_games, batch_size)]
+    totals = SimulationStats()
+    if workers == 1:
+        for batch in batches:
+            totals.merge(_play_batch(batch))
+            yield totals
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch_stats in executor.map(_play_batch, batches):
+            totals.merge(batch_stats)
+            yield totals
+
+
+def run_simulation(*args, **kwargs):
+    """
+    Runs simulate() to the end.
+    :return: Returns the final SimulationStats.
+    """
+    totals = SimulationStats()
+    for totals in simulate(*args, **kwargs):
+        pass
+    return totals
+
+
+def _play_batch(batch: tuple):
+    first_seed, number_of_games, number_of_rows, number_of_columns, number_of_mines, policy, max_moves = batch
+    stats = SimulationStats()
+    for seed in range(first_seed, first_seed + number_of_games):
+        stats.add_game(play_game(number_of_rows, number_of_columns, number_of_mines, seed, policy, max_moves))
+    return stats
+
+
+def _flag_remaining_mines(board: Board):
+    for idx in range(board.number_of_elements):
+        if board[idx].state == BoardElementState.HIDDEN:
+            board.toggle_flag_on_element(*board.index_to_coordinates(idx))
+
+
+def _histogram_mean(histogram: Counter):
+    total = sum(histogram.values())
+    return sum(value * count for value, count in histogram.items()) / total if total else 0.0
@@ -0,0 +1,195 @@
+import mmap
+import struct
+from src.board import Board, GameState
+from src.board_storage import BoardStorage, STATE_SHIFT, STATE_MASK
+from src.proximity import count_neighbouring_mines
+
+SNAPSHOT_MAGIC = b"MSWS"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<4sHIIIbQQ")
+"""Magic, version, rows, columns, mines, GameState, seed and number of moves, followed by the body: one bit per field
+for the mines, then two bits per field for the states, both in field order starting from the lowest bit."""
+
+ARCHIVE_MAGIC = b"MSWA"
+ARCHIVE_VERSION = 1
+_ARCHIVE_HEADER = struct.Struct("<4sHQQ")
+"""Magic, version, number of games and offset of the index, which follows the snapshots."""
+_INDEX_ENTRY = struct.Struct("<QQI")
+"""Game id, offset and length of a snapshot. The index is sorted by game id."""
+
+_STATE_VALUE_TABLE = bytes((value & STATE_MASK) >> STATE_SHIFT for value in range(256))
+_ASCII_DIGIT_TABLE = bytes(range(ord("0"), ord("0") + 10)) + bytes(246)
+_DIGIT_VALUE_TABLE = bytes(value - ord("0") if ord("0") <= value <= ord("9") else 0 for value in range(256))
+
+
+def board_to_bytes(board: Board):
+    """
+    :param board: The board to serialize. Its seed must fit into 64 bits.
+    :return: Returns the snapshot of the board as bytes. Proximities are not stored, they are recomputed on load.
+    """
+    if not 0 <= board.seed < 1 << 64:
+        raise ValueError("Only boards with a seed between 0 and 2^64 - 1 can be serialized.")
+    storage = board.elements
+    n = len(storage)
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, board.number_of_rows, board.number_of_columns,
+                          storage.number_of_mines, board.game_state.value, board.seed, board.number_of_moves)
+    return header + _pack_digits(storage.mine_grid(), 2, (n + 7) // 8) + \
+        _pack_digits(storage.state_bits().translate(_STATE_VALUE_TABLE), 4, (n + 3) // 4)
+
+
+def board_from_bytes(data: bytes):
+    """
+    :param data: A snapshot created by board_to_bytes.
+    :return: Returns the board of the snapshot, with computed proximities.
+    :raise ValueError: If the data is not a valid snapshot.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Snapshot is truncated.")
+    magic, version, rows, cols, number_of_mines, game_state, seed, number_of_moves = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Not a board snapshot.")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}.")
+    n = rows * cols
+    mines_size, states_size = (n + 7) // 8, (n + 3) // 4
+    if len(data) != _HEADER.size + mines_size + states_size:
+        raise ValueError("Snapshot has the wrong size for its board dimensions.")
+    mines = _unpack_bits(data[_HEADER.size:_HEADER.size + mines_size], n)
+    low_bits = _unpack_bits(data[_HEADER.size + mines_size:], 2 * n)
+    states = int.from_bytes(low_bits[0::2], "little") + 2 * int.from_bytes(low_bits[1::2], "little")
+    if b"\x03" in states.to_bytes(n, "little"):
+        raise ValueError("Snapshot contains an invalid field state.")
+    cells = bytearray((int.from_bytes(mines, "little") + (states << STATE_SHIFT)).to_bytes(n, "little"))
+    storage = BoardStorage(cells=cells)
+    if storage.number_of_mines != number_of_mines:
+        raise ValueError("Snapshot header does not match the number of mines.")
+    storage.set_proximities(count_neighbouring_mines(mines, rows, cols))
+    return Board._from_storage(rows, cols, storage, seed, GameState(game_state), number_of_moves)
+
+
+class ArchiveWriter:
+    """
+    Writes many board snapshots into a single archive file, which can be read with BoardArchive.
+    """
+    def __init__(self, path):
+        """
+        :param path: Path of the archive file, which is overwritten.
+        """
+        self._file = open(path, "wb")
+        self._file.write(_ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0, 0))
+        self._index: dict[int, tuple[int, int]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def add(self, game_id: int, board: Board):
+        """
+        :param game_id: Id of the game between 0 and 2^64 - 1, unique within the archive.
+        :param board: The board to store.
+        """
+        if game_id in self._index:
+            raise ValueError(f"Duplicate game id {game_id}.")
+        if not 0 <= game_id < 1 << 64:
+            raise ValueError("The game id must be between 0 and 2^64 - 1.")
+        snapshot = board_to_bytes(board)
+        self._index[game_id] = (self._file.tell(), len(snapshot))
+        self._file.write(snapshot)
+
+    def close(self):
+        """Writes the index and closes the file."""
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        self._file.write(b"".join(_INDEX_ENTRY.pack(game_id, *self._index[game_id]) for game_id in sorted(self._index)))
+        self._file.seek(0)
+        self._file.write(_ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(self._index), index_offset))
+        self._file.close()
+
+
+class BoardArchive:
+    """
+    Read-only, memory-mapped archive of board snapshots. Games are looked up by binary search in the sorted index, so
+    loading a game only reads a few index pages and the game's own snapshot.
+    """
+    def __init__(self, path):
+        """
+        :param path: Path of an archive file written by ArchiveWriter.
+        :raise ValueError: If the file is not a valid archive.
+        """
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _ARCHIVE_HEADER.size:
+            self._map.close()
+            raise ValueError("Not a board archive.")
+        magic, version, self._number_of_games, self._index_offset = _ARCHIVE_HEADER.unpack_from(self._map)
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+            self._map.close()
+            raise ValueError("Not a board archive, or unsupported archive version.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return self._number_of_games
+
+    def __contains__(self, game_id: int):
+        return self._find(game_id) is not None
+
+    def __getitem__(self, game_id: int):
+        """
+        :return: Returns the board of the game with the given id.
+        :raise KeyError: If the archive does not contain the game.
+        """
+        entry = self._find(game_id)
+        if entry is None:
+            raise KeyError(game_id)
+        _, offset, length = entry
+        return board_from_bytes(self._map[offset:offset + length])
+
+    def game_ids(self):
+        """
+        :return: Returns an iterator of the game ids in ascending order.
+        """
+        return (_INDEX_ENTRY.unpack_from(self._map, self._index_offset + i * _INDEX_ENTRY.size)[0]
+                for i in range(self._number_of_games))
+
+    def close(self):
+        self._map.close()
+
+    def _find(self, game_id: int):
+        low, high = 0, self._number_of_games
+        while low < high:
+            middle = (low + high) // 2
+            entry = _INDEX_ENTRY.unpack_from(self._map, self._index_offset + middle * _INDEX_ENTRY.size)
+            if entry[0] == game_id:
+                return entry
+            if entry[0] < game_id:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+
+def _pack_digits(values: bytes, base: int, size: int):
+    """
+    Packs one small value per byte into consecutive groups of bits, the first value taking the lowest bits.
+    :param values: Values between 0 and base - 1, base being 2 or 4.
+    :param size: Size of the result in bytes.
+    """
+    if not values:
+        return bytes(size)
+    return int(values.translate(_ASCII_DIGIT_TABLE)[::-1], base).to_bytes(size, "little")
+
+
+def _unpack_bits(data: bytes, number_of_bits: int):
+    """
+    :return: Returns the lowest number_of_bits bits of data, one byte of 0 or 1 per bit, starting from the lowest bit.
+    """
+    value = int.from_bytes(data, "little") & ((1 << number_of_bits) - 1)
+    return format(value, f"0{number_of_bits}b")[::-1].encode("ascii").translate(_DIGIT_VALUE_TABLE)
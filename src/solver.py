@@ -0,0 +1,156 @@
+from src.board import Board
+from src.board_storage import MINE_BIT, STATE_MASK, HIDDEN_BITS, FLAGGED_BITS, REVEALED_BITS
+
+
+class Solver:
+    """
+    Deterministic solver working on the board as the player sees it: the proximity numbers of revealed fields and the
+    flags. Every revealed field gives a constraint on the number of mines among its hidden neighbours, from which the
+    single-field rule (a constraint with no or only mines left) and the subset rule (the difference of two constraints,
+    one containing the other) deduce fields which are certainly safe or certainly mines. Flags are trusted to be mines.
+
+    The solver is incremental: it keeps its deductions and only re-examines the constraints around the fields passed to
+    update(), so it has to be told about every field whose state changed since the last call. Placing or removing a flag
+    drops the deductions of the whole component of constraints around it, since any of them may rely on the flag.
+    """
+    def __init__(self, board: Board):
+        """
+        :param board: The board to solve. The solver examines every revealed field once, on the first call of hints().
+        """
+        self._board = board
+        self._safe: set[int] = set()
+        self._mines: set[int] = set()
+        self._dirty: set[int] = set()
+        self._flagged: set[int] = set()
+        """The flagged fields as of the last call of update(), to tell which revealed fields have been flagged."""
+        self.reset()
+
+    def reset(self):
+        """
+        Drops all deductions and schedules every constraint for examination, e.g. after the board has been replaced.
+        """
+        self._safe.clear()
+        self._mines.clear()
+        cells = self._board.elements.cells
+        self._dirty = {idx for idx, cell in enumerate(cells) if cell & STATE_MASK == REVEALED_BITS}
+        self._flagged = {idx for idx, cell in enumerate(cells) if cell & STATE_MASK == FLAGGED_BITS}
+
+    def update(self, changed_indices):
+        """
+        Schedules the constraints affected by fields whose state has changed (revealed, flagged or unflagged).
+        :param changed_indices: Iterable of the indices of the changed fields, e.g. the set returned by reveal_element.
+        """
+        cells = self._board.elements.cells
+        neighbours = self._board._neighbours.neighbours
+        dirty = self._dirty
+        flagged = self._flagged
+        for idx in changed_indices:
+            state_bits = cells[idx] & STATE_MASK
+            if state_bits != REVEALED_BITS or idx in flagged:
+                # A flag has been placed or removed, or a flagged field has been revealed by a cascade.
+                self._drop_component(idx)
+            else:
+                self._safe.discard(idx)
+                self._mines.discard(idx)
+            if state_bits == FLAGGED_BITS:
+                flagged.add(idx)
+            else:
+                flagged.discard(idx)
+            dirty.add(idx)
+            dirty.update(neighbours(idx))
+
+    def _drop_component(self, start: int):
+        """
+        Drops the deductions of the fields connected to a field by constraints, i.e. alternating between unrevealed
+        fields and their revealed neighbours, and schedules those constraints for examination. The start field is
+        treated as unrevealed, since it has been flagged before.
+        """
+        cells = self._board.elements.cells
+        neighbours = self._board._neighbours.neighbours
+        safe, mines, dirty = self._safe, self._mines, self._dirty
+        seen = {start}
+        to_visit = [start]
+        while to_visit:
+            idx = to_visit.pop()
+            is_revealed = idx != start and cells[idx] & STATE_MASK == REVEALED_BITS
+            if is_revealed:
+                dirty.add(idx)
+            else:
+                safe.discard(idx)
+                mines.discard(idx)
+            for neighbour in neighbours(idx):
+                if neighbour not in seen and (cells[neighbour] & STATE_MASK == REVEALED_BITS) != is_revealed:
+                    seen.add(neighbour)
+                    to_visit.append(neighbour)
+
+    def hints(self):
+        """
+        Examines the scheduled constraints until no more deductions can be made.
+        :return: Returns a tuple of two frozensets: the indices of hidden fields which are certainly safe, and the indices
+        of hidden, unflagged fields which are certainly mines.
+        """
+        self._solve()
+        return frozenset(self._safe), frozenset(self._mines)
+
+    def _solve(self):
+        board = self._board
+        cells = board.elements.cells
+        storage = board.elements
+        neighbours = board._neighbours.neighbours
+        safe, mines, dirty = self._safe, self._mines, self._dirty
+
+        def constraint(idx: int):
+            """
+            :return: Returns the unknown neighbours of a revealed field and the number of mines among them, or None if
+            the field gives no constraint.
+            """
+            cell = cells[idx]
+            if cell & STATE_MASK != REVEALED_BITS or cell & MINE_BIT:
+                return None
+            remaining = storage.proximity(idx)
+            unknown = set()
+            for neighbour in neighbours(idx):
+                state_bits = cells[neighbour] & STATE_MASK
+                if state_bits == FLAGGED_BITS or neighbour in mines:
+                    remaining -= 1
+                elif state_bits == HIDDEN_BITS and neighbour not in safe:
+                    unknown.add(neighbour)
+            if not unknown or remaining < 0 or remaining > len(unknown):
+                return None
+            return unknown, remaining
+
+        def deduce(indices, are_mines: bool):
+            (mines if are_mines else safe).update(indices)
+            for idx in indices:
+                dirty.update(neighbours(idx))
+
+        while dirty:
+            idx = dirty.pop()
+            current = constraint(idx)
+            if current is None:
+                continue
+            unknown, remaining = current
+            if remaining == 0 or remaining == len(unknown):
+                deduce(unknown, remaining > 0)
+                continue
+            overlapping = set()
+            for field in unknown:
+                overlapping.update(neighbours(field))
+            overlapping.discard(idx)
+            for other_idx in overlapping:
+                other = constraint(other_idx)
+                if other is None:
+                    continue
+                other_unknown, other_remaining = other
+                if unknown <= other_unknown:
+                    larger, smaller = other, current
+                elif other_unknown <= unknown:
+                    larger, smaller = current, other
+                else:
+                    continue
+                difference = larger[0] - smaller[0]
+                difference_mines = larger[1] - smaller[1]
+                if difference and (difference_mines == 0 or difference_mines == len(difference)):
+                    deduce(difference, difference_mines > 0)
+                    dirty.add(idx)
+                    break
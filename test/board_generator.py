@@ -1,56 +1,109 @@
-from src.board_element import BoardElement
 from src.board import Board
+from src.board_storage import BoardStorage, MINE_BIT
+
+MINE_SYMBOL = ord('m')
+EMPTY_SYMBOLS = (ord('e'), ord('.'))
+_INVALID = 0xFF
+_CELL_TABLE = bytes(MINE_BIT if symbol == MINE_SYMBOL else 0 if symbol in EMPTY_SYMBOLS else _INVALID
+                    for symbol in range(256))
+"""Translation table from layout symbols to packed cells, marking every other symbol as invalid."""
+
 
 class BoardGenerator:
+    """
+    Builds boards with a fixed layout for tests. A layout has one row per line, with 'm' for a mine and 'e' or '.' for
+    an empty field. The layout is validated and packed into the board's storage in bulk, without placing random mines
+    first. Proximities are not calculated.
+    """
     def __init__(self, *rows: list[str]):
-        self.matrix = [row for row in rows]
-        self._validate_matrix_size()
-        self.number_of_rows = len(self.matrix)
-        self.number_of_columns = len(self.matrix[0])
-        self.number_of_mines = self._validate_matrix_elements()
-
-    def create_board(self):
-        board_elements = []
-        for row in self.matrix:
-            for item in row:
-                is_mine = True if item == 'm' else False
-                board_element = BoardElement(is_mine)
-                board_elements.append(board_element)
-        board = Board(self.number_of_rows, self.number_of_columns, 1)
-        board._elements = board_elements
-        board._number_of_mines = self.number_of_mines
-        return board
-
-    def _validate_matrix_size(self):
-        if not bool(self.matrix):
+        """
+        :param rows: The rows of the layout, each one a string or a list of single-character strings.
+        """
+        if not rows:
             raise ValueError("Matrix is empty.")
-        is_valid = True
-        initial_row_length = len(self.matrix[0])
-        for row in self.matrix:
-            if len(row) != initial_row_length:
-                is_valid = False
-        if is_valid:
-            return
-        raise ValueError("Matrix is jagged.")
+        lines = []
+        for row in rows:
+            line = "".join(row)
+            if len(line) != len(row):
+                raise ValueError("Matrix must only contain strings 'm' and 'e'.")
+            lines.append(line.encode("latin-1", "replace"))
+        self._set_up(lines)
+
+    @classmethod
+    def from_string(cls, layout: str | bytes):
+        """
+        :param layout: The layout as text, e.g. "mmee\\neme.". Trailing newlines are ignored.
+        """
+        if isinstance(layout, str):
+            layout = layout.encode("latin-1", "replace")
+        generator = cls.__new__(cls)
+        generator._set_up(layout.replace(b"\r", b"").rstrip(b"\n").split(b"\n"))
+        return generator
 
-    def _validate_matrix_elements(self):
-        valid_elements = ('m', 'e')
-        number_of_mines = 0
-        for row in self.matrix:
-            for element in row:
-                if element not in valid_elements:
-                    raise ValueError("Matrix must only contain strings 'm' and 'e'.")
-                if element == 'm':
-                    number_of_mines += 1
-        return number_of_mines
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "rb") as file:
+            return cls.from_string(file.read())
 
+    @classmethod
+    def iterate_corpus(cls, path):
+        """
+        Streams the layouts of a corpus file, which holds layouts separated by empty lines. Only one layout is kept in
+        memory at a time.
+        :param path: Path of the corpus file.
+        :return: Returns an iterator of BoardGenerators, one per layout.
+        """
+        with open(path, "rb") as file:
+            lines = []
+            for line in file:
+                line = line.rstrip(b"\r\n")
+                if line:
+                    lines.append(line)
+                elif lines:
+                    yield cls._from_lines(lines)
+                    lines = []
+            if lines:
+                yield cls._from_lines(lines)
 
+    @classmethod
+    def iterate_corpus_boards(cls, path):
+        """
+        :return: Returns an iterator of the boards of a corpus file, see iterate_corpus.
+        """
+        return (generator.create_board() for generator in cls.iterate_corpus(path))
+
+    def create_board(self):
+        """
+        :return: Returns a new board with the layout, whose storage is a copy of the packed layout.
+        """
+        return Board._from_storage(self.number_of_rows, self.number_of_columns,
+                                   BoardStorage(cells=bytearray(self._cells)), seed=0)
+
+    @classmethod
+    def _from_lines(cls, lines: list[bytes]):
+        generator = cls.__new__(cls)
+        generator._set_up(lines)
+        return generator
+
+    def _set_up(self, lines: list[bytes]):
+        """
+        Validates the layout and packs it into cells.
+        :param lines: The rows of the layout as bytes.
+        """
+        if not lines or not lines[0]:
+            raise ValueError("Matrix is empty.")
+        self.number_of_rows = len(lines)
+        self.number_of_columns = len(lines[0])
+        if any(len(line) != self.number_of_columns for line in lines):
+            raise ValueError("Matrix is jagged.")
+        cells = b"".join(lines).translate(_CELL_TABLE)
+        if _INVALID in cells:
+            raise ValueError("Matrix must only contain strings 'm' and 'e'.")
+        self._cells = cells
+        self.number_of_mines = cells.count(MINE_BIT)
 
 
 if __name__ == "__main__":
-    matrix = [['m', 'm', 'e', 'e', 'e'],
-              ['e', 'e', 'e', 'm', 'e'],
-              ['e', 'm', 'm', 'e', 'e']]
-    board = BoardGenerator(*matrix).create_board()
+    board = BoardGenerator.from_string("mmeee\neeeme\nemmee").create_board()
     board.calculate_proximities()
-    print(board)
\ No newline at end of file
+    print(board)
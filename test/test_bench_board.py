@@ -0,0 +1,25 @@
+import unittest
+from benchmarks.bench_board import BENCHMARKS, compare, run_benchmarks
+
+
+class TestBenchBoard(unittest.TestCase):
+    def test_run_benchmarks(self):
+        results = run_benchmarks(sizes=[(6, 7)], densities=[0.2], repeat=2, min_time=0.0)
+        self.assertEqual([result["operation"] for result in results], list(BENCHMARKS))
+        for result in results:
+            self.assertEqual((result["rows"], result["columns"], result["mines"]), (6, 7, 8))
+            self.assertLessEqual(result["min"], result["median"])
+
+    def test_compare(self):
+        baseline = [{"operation": "str", "rows": 9, "columns": 9, "mines": 10, "min": 1.0},
+                    {"operation": "init", "rows": 9, "columns": 9, "mines": 10, "min": 1.0}]
+        results = [{"operation": "str", "rows": 9, "columns": 9, "mines": 10, "min": 1.1},
+                   {"operation": "init", "rows": 9, "columns": 9, "mines": 10, "min": 1.5},
+                   {"operation": "init", "rows": 9, "columns": 9, "mines": 11, "min": 9.0}]
+        comparison = compare(results, baseline, threshold=0.2)
+        self.assertEqual([(key, regressed) for key, _, _, _, regressed in comparison],
+                         [("str/9x9/10", False), ("init/9x9/10", True)])
+
+
+if __name__ == '__main__':
+    unittest.main()
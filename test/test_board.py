@@ -1,5 +1,5 @@
 import unittest
-from src.board import Board, GameState
+from src.board import Board, GameState, MoveType, CellChange
 from src.board_element import BoardElementState, BoardElement
 from test.board_generator import BoardGenerator
 from random import sample
@@ -37,6 +37,17 @@ class TestBoard(unittest.TestCase):
         board.swap_mine_with_empty_element(row, col)
         self.assertEqual(board[mine_element_idx].is_mine, False)
 
+    def test_swap_mine_after_toggling_mines(self):
+        for seed in range(50):
+            board = Board(number_of_rows=4, number_of_columns=4, number_of_mines=8, seed=seed)
+            empty_idx = next(idx for idx, element in enumerate(board.elements) if not element.is_mine)
+            board[empty_idx].toggle_mine()
+            mine_idx = next(idx for idx, element in enumerate(board.elements) if element.is_mine)
+            idx_empty = board.swap_mine_with_empty_element(*board.index_to_coordinates(mine_idx))
+            self.assertFalse(board[mine_idx].is_mine)
+            self.assertTrue(board[idx_empty].is_mine)
+            self.assertEqual(sum(element.is_mine for element in board.elements), 9)
+
     def test_check_win_state(self):
         board = Board(number_of_rows=9, number_of_columns=9, number_of_mines=10)
         for element in board.elements:
@@ -47,6 +58,42 @@ class TestBoard(unittest.TestCase):
         board.check_win_state()
         self.assertEqual(board.game_state, GameState.WIN)
 
+    def test_check_win_state_not_won(self):
+        matrix = [['m', 'e'],
+                  ['e', 'e']]
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        board.reveal_element(1, 1)
+        board.reveal_element(0, 1)
+        board.reveal_element(1, 0)
+        board.check_win_state()
+        self.assertEqual(board.game_state, GameState.INITIALIZED)
+        board.toggle_flag_on_element(0, 0)
+        board.check_win_state()
+        self.assertEqual(board.game_state, GameState.WIN)
+
+    def test_counters(self):
+        matrix = [['m', 'e', 'e'],
+                  ['e', 'e', 'm']]
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        board.debug = True
+        self.assertEqual(board.remaining_mines, 2)
+        self.assertEqual(board.cells_left, 4)
+        board.toggle_flag_on_element(0, 0)
+        board.toggle_flag_on_element(0, 1)
+        self.assertEqual(board.number_of_flags, 2)
+        self.assertEqual(board.remaining_mines, 0)
+        board.toggle_flag_on_element(0, 1)
+        board.reveal_element(1, 0)
+        board.auto_reveal(1, 0)
+        self.assertEqual(board.remaining_mines, 1)
+        self.assertEqual(board.cells_left, 1)
+        board.check_win_state()
+        board.elements.cells[2] |= 1
+        with self.assertRaises(RuntimeError):
+            board.check_win_state()
+
     def test_reveal_element_cascade(self):
         board = Board(number_of_rows=5, number_of_columns=4, number_of_mines=1)
         new_board_elements = [BoardElement(True), BoardElement(True), BoardElement(True), BoardElement(True),
@@ -82,6 +129,25 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(board[1, 1].state, BoardElementState.HIDDEN)
         self.assertEqual(board.game_state, GameState.LOSS)
 
+    def test_reveal_element_returns_revealed_indices(self):
+        matrix = [['m', 'e', 'e'],
+                  ['e', 'e', 'e'],
+                  ['m', 'e', 'e']]
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        self.assertEqual(board.reveal_element(1, 0), {3})
+        self.assertEqual(board.reveal_element(1, 2), {1, 2, 4, 5, 7, 8})
+        self.assertEqual(board.reveal_element(1, 2), set())
+
+    def test_reveal_element_large_cascade(self):
+        matrix = ['m' + 'e' * 299] + ['e' * 300] * 299
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        revealed = board.reveal_element(299, 299)
+        self.assertEqual(len(revealed), 300 * 300 - 1)
+        self.assertEqual(board[0, 0].state, BoardElementState.HIDDEN)
+        self.assertEqual(board.game_state, GameState.INITIALIZED)
+
     def test_toggle_flag(self):
         matrix = [['m', 'm', 'e', 'e'],
                   ['e', 'e', 'm', 'e'],
@@ -140,6 +206,48 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(board[1, 1].state, BoardElementState.REVEALED)
         self.assertEqual(board[1, 2].state, BoardElementState.HIDDEN)
 
+    def test_play_returns_delta(self):
+        matrix = [['m', 'e', 'e'],
+                  ['e', 'e', 'e']]
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        delta = board.play(MoveType.FLAG, 0, 0)
+        self.assertEqual(delta.move, (MoveType.FLAG, 0, 0))
+        self.assertEqual(delta.cell_changes, (CellChange(0, BoardElementState.HIDDEN, BoardElementState.FLAGGED),))
+        self.assertFalse(delta.game_state_changed)
+        delta = board.play(MoveType.REVEAL, 0, 2)
+        self.assertEqual({change.index for change in delta.cell_changes}, {1, 2, 4, 5})
+        self.assertTrue(all(change.new_state == BoardElementState.REVEALED for change in delta.cell_changes))
+        self.assertEqual(board.play(MoveType.CHORD, 0, 1).cell_changes,
+                         (CellChange(3, BoardElementState.HIDDEN, BoardElementState.REVEALED),))
+
+    def test_subscribers(self):
+        matrix = [['m', 'e', 'e'],
+                  ['e', 'e', 'e']]
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        deltas = []
+        board.subscribe(deltas.append)
+        self.assertEqual(board.reveal_element(1, 1), {4})
+        board.toggle_flag_on_element(0, 0)
+        self.assertEqual(board.auto_reveal(1, 1), {1, 2, 3, 5})
+        board.check_win_state()
+        self.assertEqual([delta.move for delta in deltas],
+                         [(MoveType.REVEAL, 1, 1), (MoveType.FLAG, 0, 0), (MoveType.CHORD, 1, 1), None])
+        self.assertEqual((deltas[-1].old_game_state, deltas[-1].new_game_state), (GameState.INITIALIZED, GameState.WIN))
+        board.unsubscribe(deltas.append)
+        board.toggle_flag_on_element(0, 0)
+        self.assertEqual(len(deltas), 4)
+
+    def test_delta_game_state_loss(self):
+        matrix = [['m', 'e'],
+                  ['e', 'e']]
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        delta = board.play(MoveType.REVEAL, 0, 0)
+        self.assertEqual((delta.old_game_state, delta.new_game_state), (GameState.INITIALIZED, GameState.LOSS))
+        self.assertEqual(len(delta.cell_changes), 1)
+
     # TODO: Rework the rest of the tests to use BoardGenerator
 
 
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from src.board_element import BoardElementState
+from test.board_generator import BoardGenerator
+
+
+class TestBoardGenerator(unittest.TestCase):
+    def test_from_string(self):
+        board = BoardGenerator.from_string("mmee\neme.\n").create_board()
+        expected = BoardGenerator(['m', 'm', 'e', 'e'], "emee").create_board()
+        self.assertEqual((board.number_of_rows, board.number_of_columns, board.number_of_mines), (2, 4, 3))
+        self.assertEqual(board.elements.cells, expected.elements.cells)
+        windows_board = BoardGenerator.from_string(b"mmee\r\neme.").create_board()
+        self.assertEqual(board.elements.cells, windows_board.elements.cells)
+        self.assertTrue(all(element.state == BoardElementState.HIDDEN for element in board.elements))
+        self.assertEqual(board[1, 1].proximity, -1)
+
+    def test_invalid_layouts(self):
+        for layout in ("", "mme\nem", "mmx\neee", "mmé\neee"):
+            with self.assertRaises(ValueError):
+                BoardGenerator.from_string(layout)
+        with self.assertRaises(ValueError):
+            BoardGenerator(['m', 'ee'], ['e', 'e'])
+
+    def test_layouts_without_mines_or_empty_fields(self):
+        board = BoardGenerator.from_string("ee\nee").create_board()
+        board.calculate_proximities()
+        self.assertEqual(board.number_of_mines, 0)
+        self.assertEqual(board.reveal_element(0, 0), {0, 1, 2, 3})
+        board = BoardGenerator(["m", "m"], ["m", "m"]).create_board()
+        self.assertEqual(board.number_of_mines, 4)
+        self.assertEqual(board.cells_left, 0)
+
+    def test_boards_are_independent(self):
+        generator = BoardGenerator.from_string("me\nee")
+        board = generator.create_board()
+        board.reveal_element(1, 1)
+        self.assertEqual(generator.create_board()[1, 1].state, BoardElementState.HIDDEN)
+
+    def test_iterate_corpus(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.txt")
+            with open(path, "w") as file:
+                file.write("me\nee\n\n\nmee\n...\nem.\n\nm.\n")
+            boards = BoardGenerator.iterate_corpus_boards(path)
+            first = next(boards)
+            self.assertEqual((first.number_of_rows, first.number_of_columns), (2, 2))
+            self.assertEqual([(board.number_of_rows, board.number_of_mines) for board in boards], [(3, 2), (1, 1)])
+            with open(path, "a") as file:
+                file.write("\nmx\n")
+            with self.assertRaises(ValueError):
+                list(BoardGenerator.iterate_corpus(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from src.board import Board
+from src.board_element import BoardElement, BoardElementState
+from src.board_storage import BoardStorage, BoardElementView
+
+
+class TestBoardStorage(unittest.TestCase):
+    def test_one_byte_per_element(self):
+        storage = BoardStorage(12)
+        self.assertEqual(len(storage), 12)
+        self.assertEqual(len(storage.cells), 12)
+
+    def test_default_element(self):
+        element = BoardStorage(1)[0]
+        self.assertIsInstance(element, BoardElement)
+        self.assertEqual(element.is_mine, False)
+        self.assertEqual(element.state, BoardElementState.HIDDEN)
+        self.assertEqual(element.proximity, -1)
+
+    def test_view_writes_through(self):
+        storage = BoardStorage(4)
+        storage[2].state = BoardElementState.FLAGGED
+        storage[2].proximity = 8
+        storage[2].toggle_mine()
+        self.assertEqual(storage.state(2), BoardElementState.FLAGGED)
+        self.assertEqual(storage.proximity(2), 8)
+        self.assertEqual(storage.is_mine(2), True)
+        self.assertEqual(storage.is_mine(1), False)
+        with self.assertRaises(ValueError):
+            storage[2].proximity = 9
+
+    def test_from_elements(self):
+        elements = [BoardElement(True), BoardElement(False)]
+        elements[1].proximity = 3
+        elements[1].state = BoardElementState.REVEALED
+        storage = BoardStorage.from_elements(elements)
+        self.assertEqual([element.is_mine for element in storage], [True, False])
+        self.assertEqual(storage[-1].proximity, 3)
+        self.assertEqual(storage[-1].state, BoardElementState.REVEALED)
+        self.assertIsInstance(storage[0], BoardElementView)
+        with self.assertRaises(IndexError):
+            storage[2]
+
+    def test_large_board(self):
+        board = Board(number_of_rows=1000, number_of_columns=1000, number_of_mines=150000)
+        self.assertEqual(len(board.elements), 1000000)
+        self.assertEqual(sum(1 for cell in board.elements.cells if cell & 1), 150000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from random import Random
+from src.board import Board
+from src.generation import place_mines, EmptyElementIndex
+
+
+class TestGeneration(unittest.TestCase):
+    def test_place_mines(self):
+        cells, empty_element_index = place_mines(100, 30, Random(1))
+        self.assertEqual(len(cells), 100)
+        self.assertEqual(sum(cells), 30)
+        self.assertEqual(len(empty_element_index), 70)
+
+    def test_place_mines_excluded(self):
+        for seed in range(20):
+            cells, _ = place_mines(12, 9, Random(seed), excluded=[0, 5, 11])
+            self.assertEqual([cells[0], cells[5], cells[11]], [0, 0, 0])
+            self.assertEqual(sum(cells), 9)
+        with self.assertRaises(ValueError):
+            place_mines(12, 10, Random(0), excluded=[0, 5, 11])
+
+    def test_relocate_mine(self):
+        rng = Random(3)
+        cells = bytearray([1, 0, 1, 0, 0, 1, 0])
+        empty_element_index = EmptyElementIndex.from_cells(cells)
+        for _ in range(50):
+            idx_mine = rng.choice([idx for idx, cell in enumerate(cells) if cell])
+            idx_empty = empty_element_index.relocate_mine(idx_mine, rng)
+            self.assertEqual(cells[idx_empty], 0)
+            cells[idx_mine], cells[idx_empty] = 0, 1
+        self.assertEqual(len(empty_element_index), 4)
+
+    def test_seeded_board_is_reproducible(self):
+        board_1 = Board(number_of_rows=16, number_of_columns=30, number_of_mines=99, seed=42)
+        board_2 = Board(number_of_rows=16, number_of_columns=30, number_of_mines=99, seed=42)
+        self.assertEqual(board_1.seed, 42)
+        self.assertEqual(bytes(board_1.elements.cells), bytes(board_2.elements.cells))
+        mine_idx = next(idx for idx, element in enumerate(board_1.elements) if element.is_mine)
+        row, col = board_1.index_to_coordinates(mine_idx)
+        self.assertEqual(board_1.swap_mine_with_empty_element(row, col),
+                         board_2.swap_mine_with_empty_element(row, col))
+        self.assertEqual(bytes(board_1.elements.cells), bytes(board_2.elements.cells))
+
+    def test_swap_non_mine(self):
+        board = Board(number_of_rows=4, number_of_columns=4, number_of_mines=3, seed=5)
+        empty_idx = next(idx for idx, element in enumerate(board.elements) if not element.is_mine)
+        self.assertIsNone(board.swap_mine_with_empty_element(*board.index_to_coordinates(empty_idx)))
+        self.assertEqual(sum(element.is_mine for element in board.elements), 3)
+
+    def test_safe_opening(self):
+        for seed in range(20):
+            board = Board(number_of_rows=5, number_of_columns=5, number_of_mines=16, seed=seed, safe_opening=(2, 2))
+            board.calculate_proximities()
+            self.assertEqual(board[2, 2].proximity, 0)
+            self.assertEqual(len(board.reveal_element(2, 2)), 9)
+        with self.assertRaises(ValueError):
+            Board(number_of_rows=5, number_of_columns=5, number_of_mines=17, safe_opening=(2, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
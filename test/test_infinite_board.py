@@ -0,0 +1,98 @@
+import unittest
+from src.board import GameState
+from src.board_element import BoardElementState
+from src.infinite_board import InfiniteBoard
+
+
+class TestInfiniteBoard(unittest.TestCase):
+    def test_origin_is_safe_opening(self):
+        for seed in range(10):
+            board = InfiniteBoard(chunk_size=8, mine_density=0.3, seed=seed)
+            revealed = board.reveal_element(0, 0)
+            self.assertGreaterEqual(len(revealed), 9)
+            self.assertEqual(board.game_state, GameState.STARTED)
+            self.assertEqual(board.number_of_revealed_elements, len(revealed))
+
+    def test_proximities_across_chunk_borders(self):
+        board = InfiniteBoard(chunk_size=5, mine_density=0.25, seed=4)
+        for row in range(-7, 7):
+            for col in range(-7, 7):
+                if board[row, col].is_mine:
+                    continue
+                expected = sum(board[row + i, col + j].is_mine for i in (-1, 0, 1) for j in (-1, 0, 1)
+                               if i != 0 or j != 0)
+                self.assertEqual(board[row, col].proximity, expected)
+
+    def test_same_seed_same_board(self):
+        board_1 = InfiniteBoard(chunk_size=6, seed=9)
+        board_2 = InfiniteBoard(chunk_size=6, seed=9, max_resident_chunks=1)
+        self.assertEqual(board_1.reveal_element(0, 0), board_2.reveal_element(0, 0))
+        self.assertEqual(board_1.render(-10, -10, 20, 20), board_2.render(-10, -10, 20, 20))
+
+    def test_eviction_keeps_state(self):
+        board = InfiniteBoard(chunk_size=4, mine_density=0.2, seed=1, max_resident_chunks=2)
+        revealed = board.reveal_element(0, 0)
+        board.toggle_flag_on_element(40, 40)
+        view = board.render(-8, -8, 16, 16)
+        board.render(100, 100, 4, 12)
+        self.assertLessEqual(board.number_of_resident_chunks, 2)
+        self.assertGreater(board.number_of_stored_chunks, 0)
+        self.assertEqual(board.render(-8, -8, 16, 16), view)
+        self.assertEqual(board[40, 40].state, BoardElementState.FLAGGED)
+        self.assertEqual(board.number_of_flags, 1)
+        self.assertTrue(all(board[row, col].state == BoardElementState.REVEALED for row, col in revealed))
+
+    def test_chunk_store_grows_with_explored_chunks(self):
+        board = InfiniteBoard(chunk_size=4, seed=3, max_resident_chunks=2)
+        for chunk in range(20):
+            board.toggle_flag_on_element(0, 4 * chunk + 1)
+        self.assertEqual(board.number_of_stored_chunks, 18)
+        self.assertEqual(board.chunk_store_size, sum(len(stored[0]) for stored in board._chunk_store.values()))
+
+    def test_chunk_store_is_bounded(self):
+        board = InfiniteBoard(chunk_size=4, seed=3, max_resident_chunks=2, max_stored_bytes=100)
+        for chunk in range(20):
+            board.toggle_flag_on_element(0, 4 * chunk + 1)
+            self.assertLessEqual(board.chunk_store_size, 100)
+        self.assertLess(board.number_of_stored_chunks, 18)
+        forgotten = 20 - 2 - board.number_of_stored_chunks
+        self.assertEqual(board.number_of_flags, 20 - forgotten)
+        self.assertEqual(board[0, 1].state, BoardElementState.HIDDEN)
+        self.assertEqual(board[0, 4 * 19 + 1].state, BoardElementState.FLAGGED)
+
+    def test_untouched_chunks_are_not_stored(self):
+        board = InfiniteBoard(chunk_size=4, seed=2, max_resident_chunks=3)
+        board.render(0, 0, 4, 400)
+        self.assertEqual(board.number_of_resident_chunks, 3)
+        self.assertEqual(board.number_of_stored_chunks, 0)
+
+    def test_player_view(self):
+        board = InfiniteBoard(chunk_size=4, mine_density=0.5, seed=3)
+        board.toggle_flag_on_element(5, 5)
+        self.assertEqual(board.render(5, 5, 1, 2), "F#\n")
+        mine = next((row, col) for row in range(4, 8) for col in range(4, 8) if board[row, col].is_mine)
+        board.reveal_element(*mine)
+        self.assertEqual(board.game_state, GameState.LOSS)
+        self.assertEqual(board.render(*mine, 1, 1), "m\n")
+
+    def test_auto_reveal(self):
+        board = InfiniteBoard(chunk_size=4, mine_density=0.2, seed=5)
+        board.reveal_element(0, 0)
+        for row in range(-4, 4):
+            for col in range(-4, 4):
+                element = board[row, col]
+                if element.state == BoardElementState.REVEALED and element.proximity > 0:
+                    neighbours = [(row + i, col + j) for i in (-1, 0, 1) for j in (-1, 0, 1) if i != 0 or j != 0]
+                    for coordinates in neighbours:
+                        if board[coordinates].is_mine and board[coordinates].state == BoardElementState.HIDDEN:
+                            board.toggle_flag_on_element(*coordinates)
+                    board.auto_reveal(row, col)
+                    self.assertTrue(all(board[coordinates].state != BoardElementState.HIDDEN
+                                        for coordinates in neighbours))
+                    self.assertNotEqual(board.game_state, GameState.LOSS)
+                    return
+        self.fail("No revealed field with mines around it.")
+
+
+if __name__ == '__main__':
+    unittest.main()
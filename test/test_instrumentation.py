@@ -0,0 +1,69 @@
+import io
+import os
+import pstats
+import tempfile
+import unittest
+from src.board import Board, MoveType
+from src.instrumentation import BoardInstrumentation, profile
+from test.board_generator import BoardGenerator
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_counts_moves(self):
+        matrix = ['m' + 'e' * 9] + ['e' * 10] * 9
+        board = BoardGenerator(*matrix).create_board()
+        with BoardInstrumentation(board) as instrumentation:
+            board.calculate_proximities()
+            board.reveal_element(9, 9)
+            board.reveal_element(9, 9)
+            board.check_win_state()
+            snapshot = instrumentation.snapshot()
+        self.assertEqual(snapshot["methods"]["reveal_element"]["calls"], 2)
+        self.assertEqual(snapshot["methods"]["calculate_proximities"]["calls"], 1)
+        self.assertEqual(snapshot["methods"]["check_win_state"]["calls"], 1)
+        self.assertEqual(snapshot["methods"]["auto_reveal"]["calls"], 0)
+        self.assertEqual(snapshot["cascade_sizes"], {0: 1, 99: 1})
+        self.assertEqual(sum(snapshot["neighbour_lookups"].values()), 2)
+        self.assertGreater(max(snapshot["neighbour_lookups"]), 0)
+
+    def test_counts_moves_through_play(self):
+        matrix = ['m' + 'e' * 9] + ['e' * 10] * 9
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        with BoardInstrumentation(board) as instrumentation:
+            board.play(MoveType.FLAG, 0, 0)
+            board.play(MoveType.REVEAL, 9, 9)
+            board.play(MoveType.CHORD, 0, 1)
+            snapshot = instrumentation.snapshot()
+        self.assertEqual(snapshot["methods"]["play"]["calls"], 3)
+        self.assertEqual(snapshot["methods"]["reveal_element"]["calls"], 0)
+        self.assertEqual(snapshot["cascade_sizes"], {0: 1, 99: 1})
+        self.assertEqual(sum(snapshot["neighbour_lookups"].values()), 2)
+        self.assertGreater(max(snapshot["neighbour_lookups"]), 0)
+
+    def test_disable_restores_board(self):
+        board = Board(5, 5, 3, seed=1)
+        table = board._neighbours
+        instrumentation = board.instrument()
+        self.assertIn("reveal_element", vars(board))
+        self.assertIsNot(board._neighbours, table)
+        instrumentation.disable()
+        self.assertNotIn("reveal_element", vars(board))
+        self.assertIs(board._neighbours, table)
+        board.calculate_proximities()
+        self.assertEqual(instrumentation.snapshot()["methods"]["calculate_proximities"]["calls"], 0)
+
+    def test_profile(self):
+        board = Board(20, 20, 40, seed=1)
+        stream = io.StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "board.prof")
+            with profile(path, stream=stream):
+                board.calculate_proximities()
+            stats = pstats.Stats(path)
+        self.assertTrue(any(function[2] == "calculate_proximities" for function in stats.stats))
+        self.assertIn("calculate_proximities", stream.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
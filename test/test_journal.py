@@ -0,0 +1,65 @@
+import unittest
+from src.board import GameState, MoveType
+from src.board_element import BoardElementState
+from src.journal import MoveJournal
+
+
+class TestMoveJournal(unittest.TestCase):
+    def play_first_mine(self, journal: MoveJournal):
+        """Plays the first click on a mine, relocating it, followed by a few moves."""
+        board = journal.create_board()
+        idx_mine = next(idx for idx in range(board.number_of_elements) if board[idx].is_mine)
+        row, col = board.index_to_coordinates(idx_mine)
+        board.swap_mine_with_empty_element(row, col)
+        board.calculate_proximities()
+        board.game_state = GameState.STARTED
+        board.reveal_element(row, col)
+        board.toggle_flag_on_element(*board.index_to_coordinates(board.elements.cells.find(b"\x01")))
+        return board, (row, col)
+
+    def test_replay(self):
+        journal = MoveJournal(10, 12, 30, seed=3)
+        board, _ = self.play_first_mine(journal)
+        self.assertEqual(len(journal), 4)
+        replayed = journal.replay()
+        self.assertEqual(replayed.elements.cells, board.elements.cells)
+        self.assertEqual(replayed.game_state, board.game_state)
+        self.assertEqual(replayed.number_of_moves, 2)
+        loaded = MoveJournal.from_bytes(journal.to_bytes())
+        self.assertEqual(list(loaded.records), list(journal.records))
+        self.assertEqual(loaded.replay().elements.cells, board.elements.cells)
+
+    def test_replay_prefix(self):
+        journal = MoveJournal(10, 12, 30, seed=3)
+        board, (row, col) = self.play_first_mine(journal)
+        replayed = journal.replay(2)
+        self.assertFalse(replayed[row, col].is_mine)
+        self.assertEqual(replayed.game_state, GameState.STARTED)
+        self.assertEqual(replayed.number_of_flags, 0)
+        self.assertEqual(replayed.elements.number_of_hidden_elements, replayed.number_of_elements)
+
+    def test_undo(self):
+        journal = MoveJournal(10, 12, 30, seed=3)
+        fresh_cells = bytes(journal.replay().elements.cells)
+        board, (row, col) = self.play_first_mine(journal)
+        inverse = journal.undo()
+        self.assertEqual(inverse.cell_changes[0].new_state, BoardElementState.HIDDEN)
+        self.assertEqual(board.number_of_flags, 0)
+        journal.undo()
+        self.assertEqual(board[row, col].state, BoardElementState.HIDDEN)
+        self.assertEqual(board.number_of_moves, 0)
+        journal.undo()
+        journal.undo()
+        self.assertEqual(board.game_state, GameState.INITIALIZED)
+        self.assertEqual(bytes(board.elements.cells), fresh_cells)
+        self.assertEqual(len(journal), 0)
+        with self.assertRaises(IndexError):
+            journal.undo()
+        board.swap_mine_with_empty_element(row, col)
+        board.calculate_proximities()
+        board.play(MoveType.REVEAL, row, col)
+        self.assertEqual(journal.replay().elements.cells, board.elements.cells)
+
+
+if __name__ == '__main__':
+    unittest.main()
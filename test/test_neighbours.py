@@ -0,0 +1,46 @@
+import unittest
+from src.board import Board
+from unittest import mock
+from src import neighbours
+from src.neighbours import NeighbourTable, ArithmeticNeighbourTable, neighbour_table
+
+
+class TestNeighbours(unittest.TestCase):
+    def test_matches_bounds_checked_neighbours(self):
+        for number_of_rows, number_of_columns in ((1, 1), (1, 5), (4, 1), (2, 2), (5, 7)):
+            table = NeighbourTable(number_of_rows, number_of_columns)
+            arithmetic_table = ArithmeticNeighbourTable(number_of_rows, number_of_columns)
+            self.assertEqual(len(table.offsets), number_of_rows * number_of_columns + 1)
+            for row in range(number_of_rows):
+                for col in range(number_of_columns):
+                    expected = [i * number_of_columns + j
+                                for i in range(row - 1, row + 2) for j in range(col - 1, col + 2)
+                                if (i, j) != (row, col) and 0 <= i < number_of_rows and 0 <= j < number_of_columns]
+                    self.assertEqual(list(table.neighbours(row * number_of_columns + col)), expected)
+                    self.assertEqual(arithmetic_table.neighbours(row * number_of_columns + col), expected)
+
+    def test_table_is_shared_by_shape(self):
+        self.assertIs(neighbour_table(9, 9), neighbour_table(9, 9))
+        board_1 = Board(number_of_rows=9, number_of_columns=9, number_of_mines=10)
+        board_2 = Board(number_of_rows=9, number_of_columns=9, number_of_mines=10)
+        self.assertIs(board_1._neighbours, board_2._neighbours)
+        self.assertIsNot(neighbour_table(9, 9), neighbour_table(9, 8))
+
+    def test_large_shapes_are_computed(self):
+        with mock.patch.object(neighbours, "NEIGHBOUR_TABLE_MAX_ELEMENTS", 100):
+            self.assertIsInstance(neighbour_table(10, 10), NeighbourTable)
+            self.assertIsInstance(neighbour_table(10, 11), ArithmeticNeighbourTable)
+
+    def test_cache_is_bounded_by_size(self):
+        table_bytes = NeighbourTable(20, 20).nbytes
+        with mock.patch.object(neighbours, "NEIGHBOUR_TABLE_CACHE_BYTES", 2 * table_bytes):
+            first = neighbour_table(20, 20)
+            self.assertIs(neighbour_table(20, 20), first)
+            neighbour_table(20, 21)
+            neighbour_table(21, 20)
+            self.assertIsNot(neighbour_table(20, 20), first)
+            self.assertLessEqual(neighbours._cache_bytes, 2 * table_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+from src.board import GameState
+from src.no_guess import NoGuessLayout, NoGuessPool, generate_no_guess_layout, is_solvable_without_guessing
+from src.solver import Solver
+
+
+class TestNoGuess(unittest.TestCase):
+    def test_generated_layout_is_solvable(self):
+        layout = generate_no_guess_layout(16, 16, 40, seed=3, workers=1)
+        self.assertTrue(is_solvable_without_guessing(layout))
+        board = layout.create_board()
+        self.assertEqual(board[layout.opening].proximity, 0)
+        solver = Solver(board)
+        solver.update(board.reveal_element(*layout.opening))
+        safe, _ = solver.hints()
+        self.assertTrue(safe)
+        self.assertNotEqual(board.game_state, GameState.LOSS)
+
+    def test_unsolvable_layout(self):
+        layouts = [NoGuessLayout(9, 9, 30, seed, (4, 4)) for seed in range(20)]
+        self.assertFalse(all(is_solvable_without_guessing(layout) for layout in layouts))
+
+    def test_result_independent_of_workers(self):
+        layout_1 = generate_no_guess_layout(9, 9, 10, opening=(0, 0), seed=8, workers=1, batch_size=2)
+        layout_2 = generate_no_guess_layout(9, 9, 10, opening=(0, 0), seed=8, workers=2, batch_size=2)
+        self.assertEqual(layout_1, layout_2)
+        self.assertEqual(layout_1.opening, (0, 0))
+
+    def test_pool_is_not_waited_for(self):
+        executors = []
+
+        def create_executor(*args, **kwargs):
+            executor = ProcessPoolExecutor(*args, **kwargs)
+            executors.append(executor)
+            executor.shutdown = mock.Mock(wraps=executor.shutdown)
+            return executor
+
+        with mock.patch("src.no_guess.ProcessPoolExecutor", create_executor):
+            generate_no_guess_layout(9, 9, 10, seed=8, workers=2, batch_size=2)
+        executors[0].shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+    def test_gives_up(self):
+        with self.assertRaises(RuntimeError):
+            generate_no_guess_layout(7, 7, 30, seed=0, workers=1, max_candidates=3)
+
+    def test_pool(self):
+        with NoGuessPool(layouts_per_preset=2, workers=2, seed=1) as pool:
+            pool.fill(9, 9, 10)
+            layout = pool.take(9, 9, 10)
+            self.assertEqual((layout.number_of_rows, layout.number_of_columns, layout.number_of_mines), (9, 9, 10))
+            self.assertTrue(is_solvable_without_guessing(layout))
+            self.assertNotEqual(pool.take(9, 9, 10), layout)
+
+
+if __name__ == '__main__':
+    unittest.main()
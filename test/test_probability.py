@@ -0,0 +1,131 @@
+import unittest
+from itertools import combinations
+from random import Random
+from time import perf_counter
+from src.board import Board
+from src.board_element import BoardElementState
+from src.probability import ProbabilityEngine
+from test.board_generator import BoardGenerator
+
+
+def brute_force_probabilities(board):
+    hidden = [idx for idx, element in enumerate(board.elements) if element.state == BoardElementState.HIDDEN]
+    flagged = {idx for idx, element in enumerate(board.elements) if element.state == BoardElementState.FLAGGED}
+    revealed = [idx for idx, element in enumerate(board.elements) if element.state == BoardElementState.REVEALED]
+    mines_left = board.number_of_mines - len(flagged)
+    mine_counts = dict.fromkeys(hidden, 0)
+    number_of_solutions = 0
+    for mines in combinations(hidden, mines_left):
+        mines = set(mines) | flagged
+        if all(sum(neighbour in mines for neighbour in board._neighbours.neighbours(idx)) == board[idx].proximity
+               for idx in revealed):
+            number_of_solutions += 1
+            for idx in mines - flagged:
+                mine_counts[idx] += 1
+    return {idx: count / number_of_solutions for idx, count in mine_counts.items()}
+
+
+class TestProbability(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = Random(5)
+        for seed in range(15):
+            board = Board(number_of_rows=5, number_of_columns=5, number_of_mines=5, seed=seed)
+            board.calculate_proximities()
+            safe_indices = [idx for idx, element in enumerate(board.elements) if not element.is_mine]
+            for idx in rng.sample(safe_indices, k=3):
+                board.reveal_element(*board.index_to_coordinates(idx))
+            probabilities = ProbabilityEngine(board).probabilities()
+            self.assertTrue(probabilities.exact)
+            for idx, expected in brute_force_probabilities(board).items():
+                self.assertAlmostEqual(probabilities[idx], expected)
+
+    def test_flags_and_unconstrained_fields(self):
+        matrix = [['m', 'e', 'e', 'e'],
+                  ['e', 'e', 'e', 'm'],
+                  ['e', 'e', 'e', 'e']]
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        board.reveal_element(1, 1)
+        board.toggle_flag_on_element(0, 0)
+        probabilities = ProbabilityEngine(board).probabilities()
+        for idx, expected in brute_force_probabilities(board).items():
+            self.assertAlmostEqual(probabilities[idx], expected)
+        self.assertAlmostEqual(probabilities[3], probabilities.unconstrained)
+
+    def test_only_touched_components_are_recomputed(self):
+        matrix = ['eeeeeeeeem',
+                  'meeeeeeeee',
+                  'eeeeeeeeee',
+                  'eeeemmeeem']
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        engine = ProbabilityEngine(board)
+        engine.update(board.reveal_element(0, 0))
+        engine.update(board.reveal_element(0, 9 - 1))
+        engine.probabilities()
+        cached = dict(engine._cache)
+        engine.update(board.reveal_element(1, 9))
+        engine.probabilities()
+        kept = [key for key in engine._cache if key in cached]
+        self.assertEqual(len(kept), len(cached) - 1)
+        self.assertTrue(all(engine._cache[key] is cached[key] for key in kept))
+
+    def test_sampling_fallback(self):
+        board = Board(number_of_rows=16, number_of_columns=30, number_of_mines=99, seed=3)
+        board.calculate_proximities()
+        rng = Random(1)
+        safe_indices = [idx for idx, element in enumerate(board.elements) if not element.is_mine]
+        for idx in rng.sample(safe_indices, k=25):
+            board.reveal_element(*board.index_to_coordinates(idx))
+        exact = ProbabilityEngine(board).probabilities()
+        estimated = ProbabilityEngine(board, max_solutions=10, number_of_samples=100).probabilities()
+        self.assertFalse(estimated.exact)
+        self.assertEqual(exact.frontier.keys(), estimated.frontier.keys())
+        for idx, probability in exact.frontier.items():
+            if probability in (0.0, 1.0):
+                self.assertEqual(estimated[idx], probability)
+
+    def test_time_budget_limits_sampling(self):
+        board = Board(number_of_rows=60, number_of_columns=60, number_of_mines=500, seed=1)
+        board.calculate_proximities()
+        rng = Random(1)
+        safe_indices = [idx for idx, element in enumerate(board.elements) if not element.is_mine]
+        for idx in rng.sample(safe_indices, k=200):
+            board.reveal_element(*board.index_to_coordinates(idx))
+        engine = ProbabilityEngine(board, time_budget=0.05)
+        start = perf_counter()
+        probabilities = engine.probabilities()
+        self.assertLess(perf_counter() - start, 2.0)
+        self.assertFalse(probabilities.exact)
+        self.assertTrue(all(0.0 <= probabilities[idx] <= 1.0 for idx, element in enumerate(board.elements)
+                            if element.state == BoardElementState.HIDDEN))
+        self.assertTrue(all(component.complete for component in engine._cache.values()))
+
+    def test_time_budget_limits_exact_search(self):
+        board = Board(number_of_rows=120, number_of_columns=120, number_of_mines=2600, seed=0)
+        board.calculate_proximities()
+        rng = Random(0)
+        safe_indices = [idx for idx, element in enumerate(board.elements) if not element.is_mine]
+        for idx in rng.sample(safe_indices, k=1500):
+            board.reveal_element(*board.index_to_coordinates(idx))
+        start = perf_counter()
+        probabilities = ProbabilityEngine(board, time_budget=0.1).probabilities()
+        self.assertLess(perf_counter() - start, 3.0)
+        self.assertFalse(probabilities.exact)
+
+    def test_search_steps_are_bounded(self):
+        board = Board(number_of_rows=16, number_of_columns=30, number_of_mines=99, seed=3)
+        board.calculate_proximities()
+        rng = Random(1)
+        safe_indices = [idx for idx, element in enumerate(board.elements) if not element.is_mine]
+        for idx in rng.sample(safe_indices, k=25):
+            board.reveal_element(*board.index_to_coordinates(idx))
+        exact = ProbabilityEngine(board).probabilities()
+        self.assertTrue(exact.exact)
+        bounded = ProbabilityEngine(board, max_search_steps=20).probabilities()
+        self.assertFalse(bounded.exact)
+        self.assertTrue(all(0.0 <= bounded[idx] <= 1.0 for idx in exact.frontier))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from random import Random
+from src import proximity
+from src.proximity import count_neighbouring_mines
+from test.board_generator import BoardGenerator
+
+
+def naive_counts(mines: bytes, number_of_rows: int, number_of_columns: int):
+    counts = []
+    for row in range(number_of_rows):
+        for col in range(number_of_columns):
+            counts.append(sum(mines[i * number_of_columns + j]
+                              for i in range(max(row - 1, 0), min(row + 2, number_of_rows))
+                              for j in range(max(col - 1, 0), min(col + 2, number_of_columns))
+                              if (i, j) != (row, col)))
+    return bytes(counts)
+
+
+SHAPES = ((1, 1), (1, 9), (1, 64), (9, 1), (64, 1), (2, 5), (5, 2), (7, 13), (30, 16))
+
+
+class TestProximity(unittest.TestCase):
+    def test_matches_naive_counts(self):
+        rng = Random(7)
+        for number_of_rows, number_of_columns in ((1, 1), (1, 7), (6, 1), (3, 3), (17, 29), (40, 40)):
+            mines = bytes(rng.random() < 0.3 for _ in range(number_of_rows * number_of_columns))
+            self.assertEqual(count_neighbouring_mines(mines, number_of_rows, number_of_columns),
+                             naive_counts(mines, number_of_rows, number_of_columns))
+
+    def assert_matches_naive_counts(self, count):
+        rng = Random(11)
+        for number_of_rows, number_of_columns in SHAPES:
+            for density in (0.0, 0.3, 1.0):
+                with self.subTest(shape=(number_of_rows, number_of_columns), density=density):
+                    mines = bytes(rng.random() < density for _ in range(number_of_rows * number_of_columns))
+                    self.assertEqual(count(mines, number_of_rows, number_of_columns),
+                                     naive_counts(mines, number_of_rows, number_of_columns))
+
+    def test_shifted_rows_match_naive_counts(self):
+        self.assert_matches_naive_counts(proximity._count_with_shifted_rows)
+
+    @unittest.skipUnless(proximity.numpy is not None, "NumPy is not installed.")
+    def test_numpy_matches_naive_counts(self):
+        self.assert_matches_naive_counts(proximity._count_with_numpy)
+
+    def test_pure_python_fallback(self):
+        mines = bytes([1, 1, 1,
+                       1, 0, 1,
+                       1, 1, 1])
+        counts = proximity._count_with_shifted_rows(mines, 3, 3)
+        self.assertEqual(counts, bytes([2, 4, 2,
+                                        4, 8, 4,
+                                        2, 4, 2]))
+
+    def test_calculate_proximities_leaves_mines_untouched(self):
+        board = BoardGenerator(['m', 'e', 'e'],
+                               ['e', 'e', 'm']).create_board()
+        board.calculate_proximities()
+        self.assertEqual([element.proximity for element in board.elements], [-1, 2, 1, 1, 2, -1])
+        self.assertEqual(str(board[0, 0]), 'm')
+
+
+if __name__ == '__main__':
+    unittest.main()
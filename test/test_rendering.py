@@ -0,0 +1,56 @@
+import io
+import unittest
+from src.board import Board
+from src.rendering import BoardRenderer, PLAYER_VIEW, SOLUTION_VIEW
+from test.board_generator import BoardGenerator
+
+
+class TestBoardRenderer(unittest.TestCase):
+    def setUp(self):
+        self.board = BoardGenerator.from_string("me.\n...\n..m").create_board()
+        self.board.calculate_proximities()
+
+    def test_solution_view(self):
+        self.assertEqual(str(self.board), "*************\n"
+                                          "* m * 1 * 0 *\n*************\n"
+                                          "* 1 * 2 * 1 *\n*************\n"
+                                          "* 0 * 1 * m *\n*************\n")
+
+    def test_unassigned_proximities(self):
+        board = BoardGenerator.from_string("me").create_board()
+        self.assertEqual(str(board), "*********\n* m * -1 *\n*********\n")
+
+    def test_player_view(self):
+        self.board.toggle_flag_on_element(0, 0)
+        self.board.reveal_element(2, 0)
+        self.assertEqual(self.board.render(PLAYER_VIEW), "*************\n"
+                                                         "* F * # * # *\n*************\n"
+                                                         "* 1 * 2 * # *\n*************\n"
+                                                         "* 0 * 1 * # *\n*************\n")
+
+    def test_only_changed_rows_are_rendered(self):
+        renderer = BoardRenderer(self.board, PLAYER_VIEW)
+        renderer.render()
+        self.assertEqual(renderer.number_of_rendered_rows, 3)
+        renderer.render()
+        self.assertEqual(renderer.number_of_rendered_rows, 3)
+        self.board.toggle_flag_on_element(1, 2)
+        self.assertIn("* # * # * F *", renderer.render())
+        self.assertEqual(renderer.number_of_rendered_rows, 4)
+
+    def test_stream(self):
+        board = Board(30, 20, 90, seed=2)
+        board.calculate_proximities()
+        renderer = BoardRenderer(board, SOLUTION_VIEW)
+        stream = io.StringIO()
+        renderer.write(stream)
+        self.assertEqual(stream.getvalue(), renderer.render())
+        self.assertEqual(len(list(renderer.stream())), 31)
+
+    def test_unknown_view(self):
+        with self.assertRaises(ValueError):
+            BoardRenderer(self.board, "debug")
+
+
+if __name__ == '__main__':
+    unittest.main()
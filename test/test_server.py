@@ -0,0 +1,109 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from src.board import MoveType
+from src.client import GameClient, run_load_test
+from src.server import GameServer
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.game_server = GameServer(idle_timeout=60.0)
+        server = await self.game_server.start_tcp("127.0.0.1", 0)
+        self.port = server.sockets[0].getsockname()[1]
+        self.client = await GameClient.connect("127.0.0.1", self.port)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.game_server.close()
+
+    async def test_play(self):
+        session = await self.client.new_game(9, 9, 10, seed=3)
+        response = await self.client.move(session, MoveType.REVEAL, 4, 4)
+        self.assertEqual(response["game_state"], "STARTED")
+        self.assertTrue(response["changes"])
+        self.assertTrue(all(symbol.isdigit() for _, symbol in response["changes"]))
+        rows = await self.client.view(session)
+        self.assertEqual(len(rows), 9)
+        for idx, symbol in response["changes"]:
+            self.assertEqual(rows[idx // 9][idx % 9], symbol)
+        hidden = next(idx for idx in range(81) if rows[idx // 9][idx % 9] == "#")
+        response = await self.client.move(session, MoveType.FLAG, *divmod(hidden, 9))
+        self.assertEqual(response["changes"], [[hidden, "F"]])
+
+    async def test_errors(self):
+        with self.assertRaises(RuntimeError):
+            await self.client.move(12345, MoveType.REVEAL, 0, 0)
+        session = await self.client.new_game(4, 4, 2)
+        with self.assertRaises(RuntimeError):
+            await self.client.move(session, MoveType.REVEAL, 4, 0)
+        with self.assertRaises(RuntimeError):
+            await self.client.request("unknown", session=session)
+
+    async def test_invalid_new_games_are_rejected(self):
+        for seed in (-1, 1 << 64, "1", True):
+            with self.assertRaises(RuntimeError):
+                await self.client.new_game(4, 4, 2, seed=seed)
+        with self.assertRaises(RuntimeError):
+            await self.client.new_game(100000, 100000, 10)
+        for rows, columns, mines in ((2.5, 4, 2), (4, 4, 2.0), (float("inf"), 4, 2), ("4", 4, 2)):
+            response = self.game_server.handle_request({"op": "new", "rows": rows, "columns": columns, "mines": mines})
+            self.assertIn("error", response)
+        self.assertEqual((await self.client.request("stats"))["sessions"], 0)
+        session = await self.client.new_game(4, 4, 2)
+        for row, column in ((1.5, 0), (0, float("inf")), (True, 0)):
+            with self.assertRaises(RuntimeError):
+                await self.client.request("move", session=session, type="reveal", row=row, column=column)
+        self.assertEqual(await self.client.view(session), ["####"] * 4)
+
+    async def test_watch_coalesces_updates(self):
+        session = await self.client.new_game(9, 9, 10, seed=3)
+        updates = []
+        async with await GameClient.connect("127.0.0.1", self.port) as watcher:
+            await watcher.watch(session, updates.append)
+            await self.client.move(session, MoveType.FLAG, 0, 0)
+            await self.client.move(session, MoveType.FLAG, 0, 0)
+            await asyncio.sleep(0.05)
+        changes = {idx: symbol for update in updates for idx, symbol in update["changes"]}
+        self.assertEqual(changes[0], "#")
+
+    async def test_idle_sessions_are_evicted(self):
+        session = await self.client.new_game(9, 9, 10, seed=3)
+        revealed = await self.client.move(session, MoveType.REVEAL, 4, 4)
+        rows = await self.client.view(session)
+        self.game_server.evict_idle_sessions(now=float("inf"))
+        stats = await self.client.request("stats")
+        self.assertEqual((stats["sessions"], stats["evicted"]), (1, 1))
+        self.assertEqual(await self.client.view(session), rows)
+        self.assertEqual((await self.client.move(session, MoveType.REVEAL, 4, 4))["changes"], [])
+        self.assertEqual(revealed["game_state"], "STARTED")
+
+    async def test_eviction_skips_unserializable_sessions(self):
+        broken = await self.client.new_game(4, 4, 2)
+        session = await self.client.new_game(4, 4, 2)
+        self.game_server._sessions[broken].board._seed = -1
+        with self.assertLogs("src.server", "ERROR"):
+            self.game_server.evict_idle_sessions(now=float("inf"))
+        self.assertIsNotNone(self.game_server._sessions[broken].board)
+        self.assertIsNone(self.game_server._sessions[session].board)
+
+    async def test_load_test(self):
+        results = await run_load_test([self.client], number_of_players=5, moves_per_player=4, number_of_rows=8,
+                                      number_of_columns=8, number_of_mines=10)
+        self.assertEqual(results["moves"], 20)
+        self.assertGreater(results["moves_per_second"], 0)
+        self.assertLessEqual(results["latency_p50"], results["latency_p99"])
+        self.assertEqual((await self.client.request("stats"))["sessions"], 0)
+
+    async def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "server.sock")
+            await self.game_server.start_unix(path)
+            async with await GameClient.connect(path=path) as client:
+                session = await client.new_game(5, 5, 3)
+                self.assertEqual(len(await client.view(session)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
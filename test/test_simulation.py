@@ -0,0 +1,57 @@
+import unittest
+from src.board import MoveType
+from src.simulation import RandomPolicy, SolverPolicy, SimulationStats, play_game, run_simulation, simulate
+
+
+def cheating_policy(board, rng):
+    for idx in range(board.number_of_elements):
+        if not board[idx].is_mine:
+            yield MoveType.REVEAL, *board.index_to_coordinates(idx)
+
+
+class TestSimulation(unittest.TestCase):
+    def test_play_game_win(self):
+        result = play_game(6, 6, 5, seed=11, policy=cheating_policy)
+        self.assertTrue(result.won)
+        self.assertEqual(sum(result.cascade_sizes), 31)
+        self.assertEqual(result.number_of_moves, len(result.cascade_sizes))
+
+    def test_play_game_is_deterministic(self):
+        result_1 = play_game(9, 9, 10, seed=4, policy=RandomPolicy())
+        result_2 = play_game(9, 9, 10, seed=4, policy=RandomPolicy())
+        self.assertEqual((result_1.won, result_1.number_of_moves, result_1.cascade_sizes),
+                         (result_2.won, result_2.number_of_moves, result_2.cascade_sizes))
+
+    def test_max_moves(self):
+        result = play_game(30, 30, 1, seed=0, policy=cheating_policy, max_moves=1)
+        self.assertEqual(result.number_of_moves, 1)
+
+    def test_solver_policy(self):
+        solver_stats = run_simulation(40, 9, 9, 10, seed=1, workers=1, policy=SolverPolicy())
+        random_stats = run_simulation(40, 9, 9, 10, seed=1, workers=1, policy=RandomPolicy())
+        self.assertGreater(solver_stats.win_rate, random_stats.win_rate)
+        guessing_stats = run_simulation(40, 9, 9, 10, seed=1, workers=1, policy=SolverPolicy(use_probabilities=True))
+        self.assertGreaterEqual(guessing_stats.win_rate, solver_stats.win_rate)
+
+    def test_results_independent_of_workers(self):
+        stats_1 = run_simulation(60, 8, 8, 10, seed=7, workers=1, batch_size=25)
+        stats_2 = run_simulation(60, 8, 8, 10, seed=7, workers=2, batch_size=25)
+        self.assertEqual(stats_1.number_of_games, 60)
+        self.assertEqual(stats_1.number_of_wins, stats_2.number_of_wins)
+        self.assertEqual(stats_1.moves_per_game, stats_2.moves_per_game)
+        self.assertEqual(stats_1.cascade_sizes, stats_2.cascade_sizes)
+
+    def test_streams_running_totals(self):
+        games_played = [stats.number_of_games for stats in simulate(10, 5, 5, 3, workers=1, batch_size=4,
+                                                                    policy=cheating_policy)]
+        self.assertEqual(games_played, [4, 8, 10])
+
+    def test_stats(self):
+        stats = run_simulation(20, 5, 5, 3, workers=1, policy=cheating_policy)
+        self.assertEqual(stats.win_rate, 1.0)
+        self.assertLessEqual(stats.duration_percentile(50), stats.duration_percentile(99))
+        self.assertEqual(SimulationStats().summary()["duration_p99"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
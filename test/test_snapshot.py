@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from src.board import Board, GameState
+from src.board_element import BoardElementState
+from src.snapshot import ArchiveWriter, BoardArchive, board_from_bytes
+
+
+class TestSnapshot(unittest.TestCase):
+    def assertSameBoard(self, board: Board, restored: Board):
+        self.assertEqual((restored.number_of_rows, restored.number_of_columns, restored.number_of_mines),
+                         (board.number_of_rows, board.number_of_columns, board.number_of_mines))
+        self.assertEqual((restored.seed, restored.game_state, restored.number_of_moves),
+                         (board.seed, board.game_state, board.number_of_moves))
+        self.assertEqual(restored.elements.cells, board.elements.cells)
+
+    def test_round_trip(self):
+        board = Board(13, 7, 20, seed=2 ** 64 - 1, safe_opening=(6, 3))
+        board.calculate_proximities()
+        board.game_state = GameState.STARTED
+        board.reveal_element(6, 3)
+        board.toggle_flag_on_element(0, 0)
+        data = board.to_bytes()
+        self.assertEqual(len(data), 35 + 12 + 23)
+        restored = Board.from_bytes(data)
+        self.assertSameBoard(board, restored)
+        self.assertEqual(restored.number_of_flags, 1)
+        self.assertEqual(restored.game_state, GameState.STARTED)
+        self.assertEqual(restored[0, 0].state, BoardElementState.FLAGGED)
+
+    def test_invalid_snapshots(self):
+        board = Board(4, 4, 3, seed=1)
+        data = board.to_bytes()
+        with self.assertRaises(ValueError):
+            board_from_bytes(b"XXXX" + data[4:])
+        with self.assertRaises(ValueError):
+            board_from_bytes(data[:-1])
+        with self.assertRaises(ValueError):
+            board_from_bytes(data[:-1] + b"\xff")
+        with self.assertRaises(ValueError):
+            Board(4, 4, 3, seed=-1).to_bytes()
+
+    def test_save_and_load(self):
+        board = Board(9, 9, 10, seed=5)
+        board.calculate_proximities()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "board.bin")
+            board.save(path)
+            self.assertSameBoard(board, Board.load(path))
+
+    def test_archive(self):
+        boards = {game_id: Board(8, 8, 10, seed=game_id) for game_id in range(50, 0, -3)}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.bin")
+            with ArchiveWriter(path) as writer:
+                for game_id, board in boards.items():
+                    board.calculate_proximities()
+                    writer.add(game_id, board)
+                with self.assertRaises(ValueError):
+                    writer.add(50, boards[50])
+            with BoardArchive(path) as archive:
+                self.assertEqual(len(archive), len(boards))
+                self.assertEqual(list(archive.game_ids()), sorted(boards))
+                self.assertNotIn(49, archive)
+                with self.assertRaises(KeyError):
+                    archive[3]
+                for game_id in (2, 26, 50):
+                    self.assertSameBoard(boards[game_id], archive[game_id])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+from random import Random
+from src.board import Board
+from src.board_element import BoardElementState
+from src.solver import Solver
+from test.board_generator import BoardGenerator
+
+
+class TestSolver(unittest.TestCase):
+    def test_single_field_rule(self):
+        matrix = [['m', 'e', 'e'],
+                  ['e', 'e', 'e'],
+                  ['e', 'e', 'e']]
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        board.reveal_element(0, 1)
+        board.reveal_element(1, 0)
+        board.reveal_element(2, 2)
+        safe, mines = Solver(board).hints()
+        self.assertEqual(mines, {0})
+        self.assertEqual(safe, set())
+
+    def test_subset_rule(self):
+        matrix = [['e', 'm', 'e', 'm'],
+                  ['e', 'e', 'e', 'e']]
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        for col in range(4):
+            board.reveal_element(1, col)
+        safe, mines = Solver(board).hints()
+        self.assertEqual(safe, {0, 2})
+        self.assertEqual(mines, {1, 3})
+
+    def test_flags_count_as_mines(self):
+        matrix = [['m', 'e', 'm'],
+                  ['e', 'e', 'e']]
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        board.reveal_element(1, 1)
+        solver = Solver(board)
+        self.assertEqual(solver.hints(), (set(), set()))
+        board.toggle_flag_on_element(0, 0)
+        board.toggle_flag_on_element(0, 2)
+        solver.update([0, 2])
+        self.assertEqual(solver.hints(), ({1, 3, 5}, set()))
+
+    def test_removing_a_wrong_flag_drops_its_deductions(self):
+        matrix = [['e', 'm', 'e'],
+                  ['e', 'e', 'e'],
+                  ['e', 'e', 'e']]
+        board = BoardGenerator(*matrix).create_board()
+        board.calculate_proximities()
+        solver = Solver(board)
+        solver.update(board.reveal_element(1, 1))
+        board.toggle_flag_on_element(0, 0)
+        solver.update([0])
+        self.assertEqual(solver.hints(), ({1, 2, 3, 5, 6, 7, 8}, set()))
+        board.toggle_flag_on_element(0, 0)
+        solver.update([0])
+        self.assertEqual(solver.hints(), Solver(board).hints())
+        self.assertEqual(solver.hints(), (set(), set()))
+
+    def test_revealing_a_wrong_flag_drops_its_deductions(self):
+        board = Board(number_of_rows=12, number_of_columns=4, number_of_mines=8, seed=56)
+        board.calculate_proximities()
+        solver = Solver(board)
+        for move in "R41 R34 R26 R28 R38 F36 F36 R0 F32 F39 F37 R43".split():
+            row, col = board.index_to_coordinates(int(move[1:]))
+            if move[0] == "R":
+                solver.update(board.reveal_element(row, col))
+            else:
+                board.toggle_flag_on_element(row, col)
+                solver.update([board.coordinates_to_index(row, col)])
+            solver.hints()
+        self.assertFalse(board[39].is_mine)
+        self.assertEqual(board[39].state, BoardElementState.REVEALED)
+        safe, mines = solver.hints()
+        self.assertNotIn(33, safe)
+        self.assertEqual((safe, mines), Solver(board).hints())
+
+    def test_hints_are_sound_and_incremental(self):
+        rng = Random(2)
+        for seed in range(30):
+            board = Board(number_of_rows=12, number_of_columns=12, number_of_mines=25, seed=seed)
+            board.calculate_proximities()
+            solver = Solver(board)
+            safe_indices = [idx for idx, element in enumerate(board.elements) if not element.is_mine]
+            for idx in rng.sample(safe_indices, k=8):
+                solver.update(board.reveal_element(*board.index_to_coordinates(idx)))
+                safe, mines = solver.hints()
+                self.assertTrue(all(not board[idx].is_mine for idx in safe))
+                self.assertTrue(all(board[idx].is_mine for idx in mines))
+                self.assertTrue(all(board[idx].state == BoardElementState.HIDDEN for idx in safe | mines))
+                self.assertEqual((safe, mines), Solver(board).hints())
+
+    def test_toggled_flags_match_a_fresh_solver(self):
+        rng = Random(3)
+        for seed in range(30):
+            board = Board(number_of_rows=10, number_of_columns=10, number_of_mines=20, seed=seed)
+            board.calculate_proximities()
+            solver = Solver(board)
+            safe_indices = [idx for idx, element in enumerate(board.elements) if not element.is_mine]
+            for idx in rng.sample(safe_indices, k=5):
+                if board[idx].state == BoardElementState.HIDDEN:
+                    solver.update(board.reveal_element(*board.index_to_coordinates(idx)))
+                hidden = [idx for idx, element in enumerate(board.elements) if element.state == BoardElementState.HIDDEN]
+                flag = rng.choice(hidden)
+                board.toggle_flag_on_element(*board.index_to_coordinates(flag))
+                solver.update([flag])
+                # The deductions from a wrong flag are contradictory and depend on the order of examination.
+                if board[flag].is_mine:
+                    self.assertEqual(solver.hints(), Solver(board).hints())
+                else:
+                    solver.hints()
+                board.toggle_flag_on_element(*board.index_to_coordinates(flag))
+                solver.update([flag])
+                self.assertEqual(solver.hints(), Solver(board).hints())
+
+
+if __name__ == '__main__':
+    unittest.main()